@@ -30,9 +30,12 @@ from pybricks.hubs import EV3Brick
 from pybricks.ev3devices import Motor
 from pybricks.parameters import Port
 
-from pixy2_pybricks import (Pixy2,
-                            Pixy2ConnectionError,
-                            Pixy2DataError)
+from pixy2_pybricks import Pixy2
+from pixy2_pybricks.supervisor import Pixy2Supervisor
+
+
+# Set to True to print a summary of the loop latency at the end
+TRACE_LATENCY = False
 
 
 def limit_speed(speed):
@@ -49,6 +52,12 @@ def main():
     rmotor = Motor(Port.B)
     lmotor = Motor(Port.C)
     pixy2 = Pixy2(port=1, i2c_address=0x54)
+    supervisor = Pixy2Supervisor(pixy2)
+    tracer = None
+    if TRACE_LATENCY:
+        from latency import LatencyTracer
+        tracer = LatencyTracer()
+        pixy2.tracer = tracer
     
     # Signature we're interesed in (SIG1)
     sig = 1
@@ -69,51 +78,66 @@ def main():
     derivative_y = 0
     last_dy = 0
     
+    # Stop the motors once when the connection with Pixy2 is lost
+    link_up = True
+
     while not ev3.buttons.pressed():
         # Read data from Pixy2 (only largest object)
-        try:
-            nr_blocks, blocks = pixy2.get_blocks(sig, 1)
-            # Parse data
-            if nr_blocks > 0:
-                if sig == blocks[0].sig:
-                    # SIG1 detected, control motors
-                    x = blocks[0].x_center         # X-centroid of largest SIG1-object
-                    y = blocks[0].y_center         # Y-centroid of largest SIG1-object
-                    dx = X_REF - x                 # Error in reference to X_REF
-                    integral_x = integral_x + dx   # Calculate integral for PID
-                    derivative_x = dx - last_dx    # Calculate derivative for PID
-                    speed_x = KP*dx + KI*integral_x + KD*derivative_x  # Speed X-direction
-                    dy = Y_REF - y                 # Error in reference to Y_REF
-                    integral_y = integral_y + dy   # Calculate integral for PID
-                    derivative_y = dy - last_dy    # Calculate derivative for PID
-                    speed_y = KP*dy + KI*integral_y + KD*derivative_y  # Speed Y-direction
-                    # Calculate motorspeed out of speed_x and speed_y
-                    # Use GAIN otherwise speed will be to slow,
-                    # but limit in range [-1000,1000]
-                    rspeed = limit_speed(GAIN*(speed_y - speed_x))
-                    lspeed = limit_speed(GAIN*(speed_y + speed_x))
-                    rmotor.run(round(rspeed))
-                    lmotor.run(round(lspeed))
-                    last_dx = dx                  # Set last error for x
-                    last_dy = dy                  # Set last error for y
-                else:
-                    # SIG1 not detected, stop motors
-                    rmotor.stop()
-                    lmotor.stop()
-                    last_dx = 0
-                    last_dy = 0
-        except Pixy2ConnectionError:
-            # No data, stop program and check the connection of Pixy2
-            print('Check connection Pixy2!')
-            break
-        except Pixy2DataError:
-            # Data error, try reading again
-            pass
+        result = supervisor.call(pixy2.get_blocks, sig, 1)
+        if result is None:
+            if link_up and not supervisor.connected():
+                # Connection with Pixy2 lost, stop motors until reconnected
+                rmotor.stop()
+                lmotor.stop()
+                link_up = False
+            # Data error or no connection, try reading again
+            continue
+        link_up = True
+        nr_blocks, blocks = result
+        # Parse data
+        if nr_blocks > 0:
+            if sig == blocks[0].sig:
+                # SIG1 detected, control motors
+                x = blocks[0].x_center         # X-centroid of largest SIG1-object
+                y = blocks[0].y_center         # Y-centroid of largest SIG1-object
+                dx = X_REF - x                 # Error in reference to X_REF
+                integral_x = integral_x + dx   # Calculate integral for PID
+                derivative_x = dx - last_dx    # Calculate derivative for PID
+                speed_x = KP*dx + KI*integral_x + KD*derivative_x  # Speed X-direction
+                dy = Y_REF - y                 # Error in reference to Y_REF
+                integral_y = integral_y + dy   # Calculate integral for PID
+                derivative_y = dy - last_dy    # Calculate derivative for PID
+                speed_y = KP*dy + KI*integral_y + KD*derivative_y  # Speed Y-direction
+                # Calculate motorspeed out of speed_x and speed_y
+                # Use GAIN otherwise speed will be to slow,
+                # but limit in range [-1000,1000]
+                rspeed = limit_speed(GAIN*(speed_y - speed_x))
+                lspeed = limit_speed(GAIN*(speed_y + speed_x))
+                if tracer:
+                    tracer.control()
+                rmotor.run(round(rspeed))
+                lmotor.run(round(lspeed))
+                if tracer:
+                    tracer.motor()
+                last_dx = dx                  # Set last error for x
+                last_dy = dy                  # Set last error for y
+            else:
+                # SIG1 not detected, stop motors
+                rmotor.stop()
+                lmotor.stop()
+                last_dx = 0
+                last_dy = 0
     
     # Button pressed, stop motors, end of program
     rmotor.stop()
     lmotor.stop()
 
+    if tracer:
+        tracer.print_summary()
+    if supervisor.connection_losses:
+        print('Pixy2 connection lost {} times, max recovery {} ms'.format(
+              supervisor.connection_losses, supervisor.max_recovery_ms))
+
 
 if __name__ == '__main__':
     main()
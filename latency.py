@@ -0,0 +1,207 @@
+""" latency.py
+
+Latency tracing for the control loop of a program using Pixy2. The
+LatencyTracer stores a timestamp for four probes of every loop:
+
+request  -- request to Pixy2 started
+parse    -- response read and parsed
+control  -- output of controller (e.g. PID) calculated
+motor    -- motors commanded
+
+Pixy2.get_blocks() and Pixy2.get_linetracking_data() set the first two
+probes when a tracer is assigned to Pixy2.tracer, the program itself calls
+control() and motor(). Pixy2 sends blocks and features in separate reads
+with parsing in between, so these methods also time every I2C read and
+write (see TimedDevice). The time from request to parse is split into the
+stages 'i2c' (sum of the I2C transfers) and 'parse' (the rest). The
+timestamps are stored in a preallocated ring buffer, so tracing doesn't
+allocate memory in the control loop.
+
+Usage: tracer = LatencyTracer()
+       pixy2.tracer = tracer
+       ...
+       tracer.print_summary()
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License :
+"""
+from array import array
+
+try:
+    # MicroPython
+    from time import ticks_us, ticks_diff
+except ImportError:
+    # CPython, ticks wrap around at 2**30 as on MicroPython, so they fit in
+    # array('l') also where a C long has 32 bits
+    from time import perf_counter_ns
+
+    TICKS_PERIOD = 1 << 30
+    TICKS_HALF_PERIOD = TICKS_PERIOD >> 1
+
+    def ticks_us():
+        return (perf_counter_ns() // 1000) & (TICKS_PERIOD-1)
+
+    def ticks_diff(end, start):
+        return ((end-start+TICKS_HALF_PERIOD) & (TICKS_PERIOD-1)) \
+            - TICKS_HALF_PERIOD
+
+
+# Probes
+REQUEST = 0
+PARSE = 1
+CONTROL = 2
+MOTOR = 3
+NR_OF_PROBES = 4
+
+# Stages: name, start probe and end probe. Stage 'i2c' is the I2C time
+# between its probes, stage 'parse' the remaining time.
+STAGES = (('i2c', REQUEST, PARSE),
+          ('parse', REQUEST, PARSE),
+          ('control', PARSE, CONTROL),
+          ('motor', CONTROL, MOTOR),
+          ('total', REQUEST, MOTOR))
+
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyTracer:
+    """ Ring buffer with probe timestamps of the last capacity loops.
+
+    Keyword arguments:
+    capacity -- number of loops to keep (INT)
+
+    Public methods:
+    request       -- Probe: request to Pixy2 started, starts a new loop
+    parse         -- Probe: response read and parsed
+    control       -- Probe: controller output calculated
+    motor         -- Probe: motors commanded
+    device        -- I2C device which adds its transfer time to the loop
+    summary       -- Percentiles per stage
+    print_summary -- Print percentiles per stage
+    clear         -- Remove all recorded loops
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._ticks = array('l', [0]*(capacity*NR_OF_PROBES))
+        # Time of the I2C transfers per loop (us)
+        self._io = array('l', [0]*capacity)
+        self._device = None
+        # Bitmask of the probes set per loop
+        self._set = bytearray(capacity)
+        self._loop = -1
+        self.loops = 0
+
+    def mark(self, probe):
+        """ Store timestamp of probe for the current loop."""
+        if probe == REQUEST:
+            # New loop, overwrite oldest one
+            self._loop = (self._loop+1) % self.capacity
+            self._set[self._loop] = 0
+            self._io[self._loop] = 0
+            self.loops += 1
+        elif self._loop < 0:
+            return
+        self._ticks[self._loop*NR_OF_PROBES + probe] = ticks_us()
+        self._set[self._loop] |= 1 << probe
+
+    def request(self):
+        self.mark(REQUEST)
+
+    def parse(self):
+        self.mark(PARSE)
+
+    def control(self):
+        self.mark(CONTROL)
+
+    def motor(self):
+        self.mark(MOTOR)
+
+    def io(self, start):
+        """ Add time from start (ticks_us) until now to the I2C time of
+        the current loop, until its response is parsed."""
+        loop = self._loop
+        if loop >= 0 and not self._set[loop] & 1 << PARSE:
+            self._io[loop] += ticks_diff(ticks_us(), start)
+
+    def device(self, i2c_device):
+        """ Returns i2c_device wrapped in a TimedDevice of this tracer."""
+        if self._device is None or self._device.device is not i2c_device:
+            # First call or Pixy2 reconnected
+            self._device = TimedDevice(i2c_device, self)
+        return self._device
+
+    def durations(self, stage):
+        """ Sorted durations (us) of stage, an item of STAGES."""
+        name, start, end = stage
+        mask = 1 << start | 1 << end
+        result = []
+        for loop in range(min(self.loops, self.capacity)):
+            if self._set[loop] & mask == mask:
+                i = loop*NR_OF_PROBES
+                duration = ticks_diff(self._ticks[i+end],
+                                      self._ticks[i+start])
+                if name == 'i2c':
+                    duration = self._io[loop]
+                elif name == 'parse':
+                    duration -= self._io[loop]
+                result.append(duration)
+        result.sort()
+        return result
+
+    def summary(self):
+        """ Percentiles per stage.
+
+        Returns list with (stage, count, [p50, p90, p99], max) with
+        durations in us, stages without data are left out.
+        """
+        result = []
+        for stage in STAGES:
+            name = stage[0]
+            durations = self.durations(stage)
+            count = len(durations)
+            if count == 0:
+                continue
+            percentiles = [durations[min(count-1, count*p//100)]
+                           for p in PERCENTILES]
+            result.append((name, count, percentiles, durations[-1]))
+        return result
+
+    def print_summary(self):
+        """ Print percentiles per stage (us)."""
+        print('{:8} {:>6} {:>7} {:>7} {:>7} {:>7}'.format(
+              'stage', 'loops', 'p50', 'p90', 'p99', 'max'))
+        for name, count, percentiles, maximum in self.summary():
+            print('{:8} {:6} {:7} {:7} {:7} {:7}'.format(
+                  name, count, *(percentiles + [maximum])))
+
+    def clear(self):
+        for loop in range(self.capacity):
+            self._set[loop] = 0
+        self._loop = -1
+        self.loops = 0
+
+
+class TimedDevice:
+    """ I2C device which adds the time of every read and write to the
+    current loop of a LatencyTracer.
+
+    Keyword arguments:
+    device -- I2C device of Pixy2
+    tracer -- LatencyTracer
+    """
+    def __init__(self, device, tracer):
+        self.device = device
+        self._tracer = tracer
+
+    def write(self, reg=0x00, data=None):
+        start = ticks_us()
+        self.device.write(reg=reg, data=data)
+        self._tracer.io(start)
+
+    def read(self, reg=0x00, length=1):
+        start = ticks_us()
+        data = self.device.read(reg=reg, length=length)
+        self._tracer.io(start)
+        return data
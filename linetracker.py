@@ -26,16 +26,31 @@ Date    : June 16 2020
 Version : 1.01
 License : 
 """
-from pixy2_pybricks import (Pixy2,
-                            MainFeatures,
-                            Pixy2ConnectionError,
-                            Pixy2DataError)
+from pixy2_pybricks import Pixy2, Pixy2ConnectionError, Pixy2DataError
+from pixy2_pybricks.supervisor import Pixy2Supervisor, PIXY2_OK
+from pixy2_pybricks.line import (MainFeatures,
+                                 BarcodeEvents,
+                                 BARCODE_FORWARD,
+                                 BARCODE_LEFT,
+                                 BARCODE_RIGHT,
+                                 BARCODE_ACTIVATE,
+                                 BARCODE_DEACTIVATE)
+from pybricks.tools import StopWatch
 from rover import Rover
 
 
+# Set to True to print a summary of the loop latency at the end
+TRACE_LATENCY = False
+
 # Rover with Pixy2 camera
 rover = Rover()
 pixy2 = Pixy2(port=1)
+supervisor = Pixy2Supervisor(pixy2)
+tracer = None
+if TRACE_LATENCY:
+    from latency import LatencyTracer
+    tracer = LatencyTracer()
+    pixy2.tracer = tracer
 
 # Reerence point for linefollowing
 frame_resolution = pixy2.get_resolution()
@@ -53,22 +68,76 @@ last_dx = 0
 
 start_intersection = False
 
+# Barcode actions, every barcode is handled once when passing it. A
+# deactivate barcode stops the rover for PAUSE_TIME, or until an activate
+# barcode is held in front of Pixy2.
+PAUSE_TIME = 3000  # ms
+active = True
+pause_clock = StopWatch()
+
+def turn_forward(barcode):
+    pixy2.set_next_turn(0)
+
+def turn_left(barcode):
+    pixy2.set_next_turn(90)
+
+def turn_right(barcode):
+    pixy2.set_next_turn(-90)
+
+def activate(barcode):
+    global active
+    active = True
+
+def deactivate(barcode):
+    global active
+    active = False
+    pause_clock.reset()
+
+barcodes = BarcodeEvents(confirm=2, cooldown=15)
+barcodes.on(BARCODE_FORWARD, turn_forward)
+barcodes.on(BARCODE_LEFT, turn_left)
+barcodes.on(BARCODE_RIGHT, turn_right)
+barcodes.on(BARCODE_ACTIVATE, activate)
+barcodes.on(BARCODE_DEACTIVATE, deactivate)
+
 # Turn lamp on
 pixy2.set_lamp(upper=True, lower=False)
 
+# Stop the rover once when the connection with Pixy2 is lost
+link_up = True
+
 # Loop until a button is pressed
 while not rover.ev3.buttons.pressed():
     # Get linetracking data from Pixy2
     try:
-        data = pixy2.get_linetracking_data()
+        data = supervisor.call(pixy2.get_linetracking_data)
+        if data is None:
+            if supervisor.connected():
+                # Data error, try reading again
+                rover.ev3.speaker.beep()
+            elif link_up:
+                # Connection with Pixy2 lost, stop until reconnected
+                rover.stop()
+                link_up = False
+            continue
+        link_up = True
         # Process data
-        if data.number_of_barcodes > 0:
-            # Barcode(s) found
+        try:
+            barcodes.update(data)
+        except (Pixy2ConnectionError, Pixy2DataError, OSError):
+            # Setting the turn failed, the handler is called again next
+            # loop, a lost connection is detected by the next request
             pass
         if data.number_of_intersections > 0:
             # Intersection found
             rover.ev3.speaker.beep()
-        if data.number_of_vectors > 0:
+        if not active and pause_clock.time() >= PAUSE_TIME:
+            # Pause is over, drive on
+            active = True
+        if not active:
+            # Deactivated by barcode, wait for end of pause
+            rover.stop()
+        elif data.number_of_vectors > 0:
             # Check for intersection
             if data.vectors[0].flags == 4:
                 # Intersection in sight, sl slow down not to miss it
@@ -85,19 +154,16 @@ while not rover.ev3.buttons.pressed():
             derivative_x = dx -last_dx
             speed_x = KP*dx + KI*integral_x + KD*derivative_x
             last_dx = dx
+            if tracer:
+                tracer.control()
             rover.move(speed_x)
+            if tracer:
+                tracer.motor()
         else:
             # No vector data stop robot
             rover.stop()
         # Clear data for reading next loop
         data.clear()
-    except Pixy2ConnectionError:
-        # No data, stop program and check connection Pixy2
-        print('Check connection Pixy2!')
-        break
-    except Pixy2DataError:
-        # Data error, try reading again
-        rover.ev3.speaker.beep()
     except:
         # Unknown error, stop program
         print('Unknown error!')
@@ -107,4 +173,13 @@ while not rover.ev3.buttons.pressed():
 rover.stop()
 
 # Turn lamp off
-pixy2.set_lamp(upper=False, lower=False)
+supervisor.call(pixy2.set_lamp, False, False)
+if supervisor.status != PIXY2_OK:
+    print('Could not turn lamp off, check connection Pixy2!')
+
+if supervisor.connection_losses:
+    print('Pixy2 connection lost {} times, max recovery {} ms'.format(
+          supervisor.connection_losses, supervisor.max_recovery_ms))
+
+if tracer:
+    tracer.print_summary()
@@ -30,37 +30,38 @@ from time import sleep
 
 from pybricks.hubs import EV3Brick
 from pybricks.parameters import Port
-from pixy2_pybricks import (Pixy2,
-                            Pixy2ConnectionError,
-                            Pixy2DataError)
+from pixy2_pybricks import Pixy2
+from pixy2_pybricks.supervisor import Pixy2Supervisor
 
 
 def main():
     # Objects for ev3-brick and Pixy2 camera
     ev3 = EV3Brick()
     pixy2 = Pixy2(port=1, i2c_address=0x54)
+    supervisor = Pixy2Supervisor(pixy2)
     
     # Detect all signatures (set sig to 255)
     sig = 255
     max_blocks = 10
+    connection_losses = 0
 
     while not ev3.buttons.pressed():
         # Read data from Pixy2
-        try:
-            nr_blocks, blocks = pixy2.get_blocks(sig, max_blocks)
-            print('{} blocks detected:'.format(nr_blocks))
-            # Parse data
-            if nr_blocks > 0:
-                # Print information about detected blocks
-                for block in blocks:
-                    print(block, '\n')
-        except Pixy2ConnectionError:
-            # No data, stop program and check the connection of Pixy2
-            print('Check connection Pixy2!')
-            break
-        except Pixy2DataError:
-            # Data error, try reading again
-            pass
+        result = supervisor.call(pixy2.get_blocks, sig, max_blocks)
+        if supervisor.connection_losses != connection_losses:
+            # Connection lost, print message once
+            connection_losses = supervisor.connection_losses
+            print('Check connection Pixy2! Reconnecting...')
+        if result is None:
+            # Data error or no connection, try reading again
+            continue
+        nr_blocks, blocks = result
+        print('{} blocks detected:'.format(nr_blocks))
+        # Parse data
+        if nr_blocks > 0:
+            # Print information about detected blocks
+            for block in blocks:
+                print(block, '\n')
     
 
 if __name__ == '__main__':
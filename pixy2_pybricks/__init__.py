@@ -0,0 +1,78 @@
+""" Python package for using Pixy2 for LEGO Mindstorms on PyBricks
+
+Only the core of the package (class Pixy2 and the errors) is loaded on
+import. The submodules are loaded on first use, by calling a method of
+Pixy2 or by using one of their classes:
+
+settings        -- get_version, get_resolution, set_lamp
+blocks          -- get_blocks
+line            -- set_mode, get_linetracking_data, set_next_turn,
+                   set_default_turn, set_vector and barcode constants
+video           -- get_rgb
+supervisor      -- Pixy2Supervisor
+
+Public classes:
+Pixy2           -- Common functionality of Pixy2 (core)
+Pixy2Version    -- Version information (settings)
+PixyResolution  -- Width and height of frame (settings)
+Block           -- Color Connected Components packet (blocks)
+Pixy2Mode       -- Modes for linetracking (line)
+Vector          -- Vector data (line)
+Intersection    -- Intersection data (line)
+Branch          -- Branch data (line)
+Barcode         -- Barcode data (line)
+MainFeatures    -- Common linetracking data (line)
+BarcodeEvents   -- Debounced barcode events with handlers (line)
+RGBSampler      -- Batched sampling of video RGB values (video)
+RGBSamples      -- RGB values of sampled pixels (video)
+Pixy2Supervisor -- Reconnect and health monitor (supervisor)
+
+
+Author  : Kees Smit
+Date    : Jun 16 2020
+Version : 1.00
+License :
+"""
+from .core import (Pixy2,
+                   Pixy2DataError,
+                   Pixy2ConnectionError,
+                   check_packet_type,
+                   load_submodule)
+
+
+# Submodule of the names loaded on first use
+_LAZY_NAMES = {
+    'Pixy2Version': 'settings',
+    'PixyResolution': 'settings',
+    'Block': 'blocks',
+    'Pixy2Mode': 'line',
+    'Vector': 'line',
+    'Intersection': 'line',
+    'Branch': 'line',
+    'Barcode': 'line',
+    'MainFeatures': 'line',
+    'BarcodeEvents': 'line',
+    'BARCODE_FORWARD': 'line',
+    'BARCODE_LEFT': 'line',
+    'BARCODE_RIGHT': 'line',
+    'BARCODE_DEACTIVATE': 'line',
+    'BARCODE_ACTIVATE': 'line',
+    'NR_OF_BARCODES': 'line',
+    'RGBSampler': 'video',
+    'RGBSamples': 'video',
+    'check_rgb_result': 'video',
+    'Pixy2Supervisor': 'supervisor',
+    'PIXY2_OK': 'supervisor',
+    'PIXY2_DEGRADED': 'supervisor',
+    'PIXY2_RECONNECTING': 'supervisor',
+}
+
+
+def __getattr__(name):
+    """ Load name from its submodule on first use."""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(name)
+    value = getattr(load_submodule(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,66 @@
+""" pixy2_pybricks.blocks
+
+Color connected components: detected objects (blocks) of the signatures
+taught to Pixy2.
+
+Public classes:
+Block           -- Color Connected Components packet
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License : 
+"""
+from .core import check_packet_type
+
+
+def get_blocks(self, sigmap, max_blocks):
+    """ Get blockdata for sigmap."""
+    blocks = []
+    tracer = self.tracer
+    # Time the I2C transfers when tracing latency
+    device = tracer.device(self.pixy2) if tracer else self.pixy2
+    # Request data
+    data = [174, 193, 32, 2, sigmap, max_blocks]
+    if tracer:
+        tracer.request()
+    device.write(reg=0x00, data=bytes(data))
+    # Read header
+    header = device.read(reg=0x00, length=6)
+    check_packet_type(header, 33)
+    length_of_payload = header[3]
+    nr_detected_blocks = int(length_of_payload/14)
+    # Read and parse data
+    for b in range(0, nr_detected_blocks):
+        data = device.read(reg=0x00, length=14)
+        blocks.append(Block())
+        blocks[b].sig = data[1] << 8 | data[0]
+        blocks[b].x_center = data[3] << 8 | data[2]
+        blocks[b].y_center = data[5] << 8 | data[4]
+        blocks[b].width= data[7] << 8 | data[6]
+        blocks[b].height = data[9] << 8 | data[8]
+        blocks[b].angle = data[11] << 8 | data[10]
+        blocks[b].tracking_index = data[12]
+        blocks[b].age = data[13]
+    if tracer:
+        tracer.parse()
+
+    return nr_detected_blocks, blocks
+
+
+class Block:
+    """ Datablock with detected signature."""
+    def __init__(self):
+        self.sig = None
+        self.x_center = None
+        self.y_center = None
+        self.width = None
+        self.height = None
+        self.angle = None
+        self.tracking_index = None
+        self.age = None
+
+    def __str__(self):
+        desc = 'sig: {}\nx: {}\ny: {}\nwidth:  {}\nheight: {}'.format(
+            self.sig, self.x_center, self.y_center, self.width, self.height)
+        return desc
@@ -0,0 +1,161 @@
+""" pixy2_pybricks.core
+
+Core of the Pixy2 protocol: class Pixy2 and error handling.
+
+The methods of Pixy2 are implemented in the submodules settings, blocks,
+line and video. A submodule is loaded the first time one of its methods is
+called, after that the method of the submodule replaces the stub in class
+Pixy2. So a program only loads the parts of the library it uses.
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License :
+"""
+import sys
+
+
+class Pixy2:
+    """ This class contains all general functionalities of Pixy2.
+
+    Keyword arguments:
+    port        -- portnumber to wich the Pixy2 is connected (INT)
+    i2c_address -- i2c address for communicating with Pixy2 (hexa-decimal)
+
+    Public methods:
+    get_version           -- Get harware and firmware version of Pixy2
+    get_resolution        -- Get resolution of Pixy2 frame
+    set_lamp              -- Turn upper and lower leds of Pixys on or off
+    get_blocks            -- Get data about detected signatures
+    set_mode              -- Set mode for linetracking
+    get_linetracking_data -- Get data for linetracking
+    set_next_turn         -- Set turn at next intersection
+    set_default_turn      -- Set default turn at intersections
+    set_vector            -- Set vector to use at an intersection
+    get_rgb               -- Get RGB value of a pixel of the video frame
+    reconnect             -- Open the I2C device of Pixy2 again
+    """
+    def __init__(self, port=1, i2c_address=0x54):
+        """ Initialising Pixy2 class.
+
+        Keyword arguments:
+        port        -- portnumber to wich the Pixy2 is connected
+                       (INT in range (1, 4)).
+        i2c_address -- i2c address for communicating with Pixy2
+                       (hexa-decimal, set in configuration Pixy2).
+        """
+        from pybricks.parameters import Port
+
+        if port == 1:
+            ev3_port = Port.S1
+        elif port == 2:
+            ev3_port = Port.S2
+        elif port == 3:
+            ev3_port = Port.S3
+        elif port == 4:
+            ev3_port = Port.S4
+        else:
+            raise ValueError('Portnumber out of range (1, 4)')
+        self._ev3_port = ev3_port
+        self._i2c_address = i2c_address
+        self.reconnect()
+        # Pixy2Mode LINE_MODE_DEFAULT
+        self._mode = 0x00
+        # Lamp state (upper, lower), None when never set
+        self._lamp = None
+        # Optional LatencyTracer (see latency.py)
+        self.tracer = None
+
+    def reconnect(self):
+        """ Open the I2C device of Pixy2 (again), e.g. after the cable
+        was disconnected."""
+        from pybricks.iodevices import I2CDevice
+        self.pixy2 = I2CDevice(self._ev3_port, self._i2c_address)
+
+    # Stubs, replaced by the methods of the submodules on first call
+
+    def get_version(self):
+        """ Queries and receives the firmware and hardware version Pixy2."""
+        return load_method('settings', 'get_version')(self)
+
+    def get_resolution(self):
+        """ Gets the width and height of the frames."""
+        return load_method('settings', 'get_resolution')(self)
+
+    def set_lamp(self, upper, lower):
+        """ Turn on/off upper and lower LED's of Pixy2 (False=off, True=on)."""
+        return load_method('settings', 'set_lamp')(self, upper, lower)
+
+    def get_blocks(self, sigmap, max_blocks):
+        """ Get blockdata for sigmap."""
+        return load_method('blocks', 'get_blocks')(self, sigmap, max_blocks)
+
+    def set_mode(self, mode):
+        """ Set mode for Pixy2."""
+        return load_method('line', 'set_mode')(self, mode)
+
+    def get_linetracking_data(self):
+        """ Get linetracking data from Pixy2."""
+        return load_method('line', 'get_linetracking_data')(self)
+
+    def set_next_turn(self, angle):
+        """ Set direction for turn at next intersection."""
+        return load_method('line', 'set_next_turn')(self, angle)
+
+    def set_default_turn(self, angle):
+        """ Set default direction for turn at an intersection."""
+        return load_method('line', 'set_default_turn')(self, angle)
+
+    def set_vector(self, index):
+        """ Set vector to use at an intersection, use this method when
+        Pixy2 is in mode LINE_MODE_MANUAL_SELECT_VECTOR."""
+        return load_method('line', 'set_vector')(self, index)
+
+    def get_rgb(self, x, y, saturate=True):
+        """ Get RGB value (r, g, b) of pixel (x, y) of the video frame."""
+        return load_method('video', 'get_rgb')(self, x, y, saturate)
+
+
+def load_submodule(module_name):
+    """ Import submodule of pixy2_pybricks (e.g. 'line') and return it."""
+    full_name = 'pixy2_pybricks.' + module_name
+    module = sys.modules.get(full_name)
+    if module is None:
+        __import__(full_name)
+        module = sys.modules[full_name]
+    return module
+
+
+def load_method(module_name, name):
+    """ Replace stub name of class Pixy2 by function of submodule."""
+    method = getattr(load_submodule(module_name), name)
+    setattr(Pixy2, name, method)
+    return method
+
+
+# Pixy2 custom DataError:
+class Pixy2DataError(Exception):
+    """ Custom error for Pixy data communication."""
+    def __init__(self, message, errors):
+        super().__init__(message)
+        self.errors = errors
+        print(errors)
+
+class Pixy2ConnectionError(Exception):
+    """ Custom error for Pixy connection fault."""
+    def __init__(self, message, errors):
+        super().__init__(message)
+        self.errors = errors
+        print(errors)
+
+def check_packet_type(header, packet_type):
+    """ Check if data packet type is correct, raise exception when not."""
+    if header[2] == 0:
+        # No data at all, Pixy2 connected?
+        msg = 'Empty data packet, check if Pixy2 is properly connected!'
+        raise Pixy2ConnectionError(msg, 'Pixy2ConnectionError')
+    elif header[2] != packet_type:
+        # Read wrong type of packet
+        msg = "Read wrong type of packet: {} instead of {}".format(
+              header[2], packet_type)
+        raise Pixy2DataError(msg, 'Pixy2DataError')
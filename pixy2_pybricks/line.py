@@ -0,0 +1,381 @@
+""" pixy2_pybricks.line
+
+Linetracking: main features (vectors, intersections and barcodes), the
+linetracking mode, turns at intersections and debounced barcode events.
+
+Public classes:
+Pixy2Mode       -- Modes for linetracking
+Vector          -- Vector data
+Intersection    -- Intersection data
+Branch          -- Branch data
+Barcode         -- Barcode data
+MainFeatures    -- Common linetracking data
+BarcodeEvents   -- Debounced barcode events with handlers
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License : 
+"""
+from .core import check_packet_type
+
+
+# Barcode constants
+BARCODE_FORWARD = 1
+BARCODE_LEFT = 0
+BARCODE_RIGHT = 5
+BARCODE_DEACTIVATE = 12
+BARCODE_ACTIVATE = 13
+NR_OF_BARCODES = 16
+
+
+def set_mode(self, mode):
+    """ Set mode for Pixy2."""
+    data = [174, 193, 54, 1, mode]
+    self.pixy2.write(reg=0x00, data=bytes(data))
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=10)
+    check_packet_type(header, 1)
+    # Remember mode for Pixy2Supervisor
+    self._mode = mode
+
+
+def get_linetracking_data(self):
+    """ Get linetracking data from Pixy2."""
+
+    mainfeatures = MainFeatures()
+    vector = Vector()
+    intersection = Intersection()
+    branch = Branch()
+    barcode = Barcode()
+    payload_read = 0
+    tracer = self.tracer
+    # Time the I2C transfers when tracing latency
+    device = tracer.device(self.pixy2) if tracer else self.pixy2
+
+    # Request
+    data = [174,193, 48, 2, 0, 7]
+    if tracer:
+        tracer.request()
+    device.write(reg=0x00, data=bytes(data))
+
+    # Read header info
+    header = device.read(reg=0x00, length=6)
+    # Parse header info
+    check_packet_type(header, 49)
+    mainfeatures.length_of_payload = header[3]
+
+    # Read payload data
+    while payload_read < mainfeatures.length_of_payload:
+        # Read feature type and length
+        data = device.read(reg=0x00, length=2)
+        feature_type = data[0]
+        feature_length = data[1]
+        # Read feature data
+        if feature_type == 1:
+            # Feature type is 'vector'
+            data = device.read(reg=0x00, length=feature_length)
+            vector.x0 = data[0]
+            vector.y0 = data[1]
+            vector.x1 = data[2]
+            vector.y1 = data[3]
+            vector.index = data[4]
+            vector.flags = data[5]
+            mainfeatures.add_vector(vector)
+        elif feature_type == 2:
+            # feature type is 'intersection'
+            data = device.read(reg=0x00, length=feature_length)
+            intersection.x = data[0]
+            intersection.y = data[1]
+            intersection.nr_of_branches = data[2]
+            for i in range(0, intersection.nr_of_branches):
+                i4 = i*4
+                branch.index = data[i4+0]
+                branch.angle = data[14+1]
+                branch.angle_byte1 = data[i4+2]
+                branch.angle_byte2 = data[i4+3]
+                intersection.add_branch(branch)
+            mainfeatures.add_intersection(intersection)
+        elif feature_type == 4:
+            # Feature type is 'barcode'
+            data = device.read(reg=0x00, length=feature_length)
+            barcode.x = data[0]
+            barcode.y = data[1]
+            barcode.flags = data[2]
+            barcode.code = data[3]
+            mainfeatures.add_barcode(barcode)
+        else:
+            # Unknown feature type
+            mainfeatures.error = True
+
+        payload_read += feature_length + 2
+
+    if tracer:
+        tracer.parse()
+
+    # Return data
+    return mainfeatures
+
+
+def set_next_turn(self, angle):
+    """ Set direction for turn at next intersection."""
+    data = [174, 193, 58, 2]
+    data_bytes = bytes(data)
+    # Add angle (2 bytes, little endian, signed)
+    data_bytes += bytes([angle & 0xff, (angle >> 8) & 0xff])
+    self.pixy2.write(reg=0x00, data=data_bytes)
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=10)
+    check_packet_type(header, 1)
+
+
+def set_default_turn(self, angle):
+    """ Set default direction for turn at an intersection."""
+    data = [174, 193, 60, 2]
+    data_bytes = bytes(data)
+    # Add angle (2 bytes, little endian, signed)
+    data_bytes += bytes([angle & 0xff, (angle >> 8) & 0xff])
+    self.pixy2.write(reg=0x00, data=data_bytes)
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=10)
+    check_packet_type(header, 1)
+
+
+def set_vector(self, index):
+    """ Set vector to use at an intersection, use this method when
+    Pixy2 is in mode LINE_MODE_MANUAL_SELECT_VECTOR."""
+    data = [174, 193, 56, 1, index]
+    self.pixy2.write(reg=0x00, data=bytes(data))
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=10)
+    check_packet_type(header, 1)
+
+
+class BarcodeEvents:
+    """ Debounced barcode events from linetracking data.
+
+    A barcode has to be seen in confirm consecutive frames before the
+    handler for its code is called, only once per physical barcode. After
+    that the code has to be out of sight for cooldown frames, before a
+    next barcode with the same code can call the handler again. When a
+    handler raises an exception, update() passes it on and the handler is
+    called again for the next frame with the barcode in sight. The other
+    codes of the frame are processed first, update() raises the first
+    exception after calling all handlers.
+
+    Keyword arguments:
+    confirm  -- number of frames to confirm a barcode (INT)
+    cooldown -- number of frames a barcode has to be out of sight (INT)
+
+    Public methods:
+    on     -- Set handler for a code
+    update -- Process barcodes of one frame and call handlers
+    reset  -- Forget all barcodes in sight
+    """
+    def __init__(self, confirm=2, cooldown=10):
+        self.confirm = confirm
+        self.cooldown = cooldown
+        # Dispatch table, handler per code
+        self._handlers = [None]*NR_OF_BARCODES
+        # State per code: frames seen, frames out of sight, event fired
+        self._seen = [0]*NR_OF_BARCODES
+        self._missing = [0]*NR_OF_BARCODES
+        self._fired = [0]*NR_OF_BARCODES
+        # Bitmask of codes with state
+        self._active = 0
+
+    def on(self, code, handler):
+        """ Set handler for code, handler(barcode) is called with the
+        Barcode. Use None to remove the handler."""
+        self._handlers[code] = handler
+
+    def update(self, mainfeatures):
+        """ Process barcodes of MainFeatures of one frame, returns number of
+        handlers called."""
+        present = 0
+        barcodes = [None]*NR_OF_BARCODES if mainfeatures.barcodes else None
+        for barcode in mainfeatures.barcodes:
+            code = barcode.code & 0x0f
+            present |= 1 << code
+            barcodes[code] = barcode
+        # Update state of all codes, then call handlers of confirmed codes
+        confirmed = 0
+        active = self._active | present
+        code = 0
+        while active:
+            if active & 1:
+                if present >> code & 1:
+                    if self._seen_code(code):
+                        confirmed |= 1 << code
+                else:
+                    self._missed_code(code)
+            active >>= 1
+            code += 1
+        events = 0
+        error = None
+        code = 0
+        while confirmed:
+            if confirmed & 1:
+                try:
+                    events += self._fire(code, barcodes[code])
+                except Exception as e:
+                    # Call other handlers first, raise first error after
+                    if error is None:
+                        error = e
+            confirmed >>= 1
+            code += 1
+        if error is not None:
+            raise error
+        return events
+
+    def _seen_code(self, code):
+        """ Code in sight, True when confirmed and not fired yet."""
+        self._active |= 1 << code
+        self._missing[code] = 0
+        if self._fired[code]:
+            return False
+        self._seen[code] += 1
+        return self._seen[code] >= self.confirm
+
+    def _fire(self, code, barcode):
+        """ Call handler of code, returns number of handlers called."""
+        handler = self._handlers[code]
+        if handler is None:
+            self._fired[code] = 1
+            return 0
+        # Fired when the handler returns, if it raises it's called again
+        handler(barcode)
+        self._fired[code] = 1
+        return 1
+
+    def _missed_code(self, code):
+        """ Code out of sight, forget it after cooldown."""
+        self._seen[code] = 0
+        if self._fired[code]:
+            self._missing[code] += 1
+            if self._missing[code] < self.cooldown:
+                return
+            self._fired[code] = 0
+            self._missing[code] = 0
+        self._active &= ~(1 << code)
+
+    def reset(self):
+        for code in range(NR_OF_BARCODES):
+            self._seen[code] = 0
+            self._missing[code] = 0
+            self._fired[code] = 0
+        self._active = 0
+
+
+# Pixy2 specific datatypes
+
+class Pixy2Mode:
+    """ Pixy2 modes for linetracking."""
+    def __init__(self):
+        self.LINE_MODE_DEFAULT = 0x00
+        self.LINE_MODE_TURN_DELAYED = 0x01
+        self.LINE_MODE_MANUAL_SELECT_VECTOR = 0x02
+        self.LINE_MODE_WHITE_LINE = 0x80
+
+
+# General datatypes
+
+class Vector:
+    """ Vector data for linetracking."""
+    def __init__(self):
+        self.x0 = 0
+        self.y0 = 0
+        self.x1 = 0
+        self.y1 = 0
+        self.index = 0
+        self.flags = 0
+
+
+class Intersection:
+    """ Intersection data for linetracking."""
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.nr_of_branches = 0
+        self.branches = []
+
+    def add_branch(self, branch):
+        """ Add branch to intersection."""
+        b = Branch()
+        b.index = branch.index
+        b.angle = branch.angle
+        self.branches.append(b)
+
+
+class Branch:
+    """ Data for branch of intersection."""
+    def __init__(self):
+        self.index = 0
+        self.angle = 0
+        self.angle_byte1 = 0
+        self.angle_byte2 = 0
+
+
+class Barcode:
+    """ Date of detected barcode."""
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.flags = 0
+        self.code = 0
+
+
+class MainFeatures:
+    """ Data for linetracking."""
+    def __init__(self):
+        self.length_of_payload = 0
+        self.number_of_vectors = 0
+        self.number_of_intersections = 0
+        self.number_of_barcodes = 0
+        self.vectors = []
+        self.intersections = []
+        self.barcodes = []
+
+    def add_vector(self, vector):
+        v = Vector()
+        v.x0 = vector.x0
+        v.y0 = vector.y0
+        v.x1 = vector.x1
+        v.y1 = vector.y1
+        v.index = vector.index
+        v.flags = vector.flags
+        self.vectors.append(v)
+        self.number_of_vectors += 1
+
+    def add_intersection(self, intersection):
+        ints = Intersection()
+        b = Branch()
+        ints.x = intersection.x
+        ints.y = intersection.y
+        ints.nr_of_branches = intersection.nr_of_branches
+        for branch in intersection.branches:
+            b.index = branch.index
+            b.angle = branch.angle
+            b.angle_byte1 = branch.angle_byte1
+            b.angle_byte2 = branch.angle_byte2
+            ints.add_branch(b)
+        self.intersections.append(ints)
+        self.number_of_intersections += 1
+
+    def add_barcode(self, barcode):
+        b = Barcode()
+        b.x = barcode.x
+        b.y = barcode.y
+        b.flags = barcode.flags
+        b.code = barcode.code
+        self.barcodes.append(b)
+        self.number_of_barcodes += 1
+
+    def clear(self):
+        self.length_of_payload = 0
+        self.number_of_vectors = 0
+        self.number_of_intersections = 0
+        self.number_of_barcodes = 0
+        self.vectors.clear()
+        self.intersections.clear()
+        self.barcodes.clear()
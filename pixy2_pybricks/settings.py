@@ -0,0 +1,88 @@
+""" pixy2_pybricks.settings
+
+Device settings and information of Pixy2: version, frame resolution and
+lamp.
+
+Public classes:
+Pixy2Version    -- Version information
+PixyResolution  -- Width and height of frame
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License : 
+"""
+from .core import check_packet_type
+
+
+def get_version(self):
+    """ Queries and receives the firmware and hardware version Pixy2."""
+    pixy2_version = Pixy2Version()
+    # Request data
+    data = [174, 193, 14, 0]
+    self.pixy2.write(reg=0x00, data=bytes(data))
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=6)
+    check_packet_type(header, 15)
+    # Read and parse data
+    data = self.pixy2.read(reg=0x00, length=16)
+    pixy2_version.hardware = data[1] << 8 | data[0]
+    fw = [str(data[2]), str(data[3]), str(data[5] << 8 | data[4])]
+    pixy2_version.firmware = '.'.join(fw)
+    pixy2_version.firmware_type = data[6:-1].decode()
+
+    return pixy2_version
+
+
+def get_resolution(self):
+    """ Gets the width and height of the frames."""
+    resolution = PixyResolution()
+    data = [174, 193, 12, 1, 0]
+    self.pixy2.write(reg=0X00, data=bytes(data))
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=6)
+    check_packet_type(header, 13)
+    # Read and parse data
+    data = self.pixy2.read(reg=0x00, length=4)
+    resolution.width = data[1] << 8 | data[0]
+    resolution.height = data[3] << 8 | data[2]
+    return resolution
+
+
+def set_lamp(self, upper, lower):
+    """ Turn on/off upper and lower LED's of Pixy2 (False=off, True=on)."""
+    data = [174, 193, 22, 2, upper, lower]
+    self.pixy2.write(reg=0x00, data=bytes(data))
+    # Read header
+    header = self.pixy2.read(reg=0x00, length=10)
+    check_packet_type(header, 1)
+    # Remember state for Pixy2Supervisor
+    self._lamp = (upper, lower)
+
+
+# Pixy2 specific datatypes
+
+class Pixy2Version:
+    """ Version information of Pixy2."""
+    def __init__(self):
+        self.hardware = None
+        self.firmware = None
+        self.firmware_type = None
+    
+    def __str__(self):
+        str_version = 'Hardware version: {}\nFirmware version: {} {}\n'.format(
+            self.hardware, self.firmware, self.firmware_type)
+        return str_version
+
+
+# General datatypes
+
+class PixyResolution:
+    """ Frame resolution."""
+    def __init__(self):
+        self.width = None
+        self.height = None
+
+    def __str__(self):
+        return 'Resolution: widht={}, height={}\n'.format(
+            self.width, self.height)
@@ -0,0 +1,129 @@
+""" pixy2_pybricks.supervisor
+
+Connection supervisor for Pixy2: reconnects when the link with Pixy2 is
+lost, instead of ending the program.
+
+Public classes:
+Pixy2Supervisor -- Reconnect and health monitor for Pixy2
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License :
+"""
+from pybricks.tools import StopWatch
+
+from .core import Pixy2ConnectionError, Pixy2DataError
+
+
+# Health status
+PIXY2_OK = 0            # Last request succeeded
+PIXY2_DEGRADED = 1      # Last request(s) returned wrong data
+PIXY2_RECONNECTING = 2  # Link lost, trying to reconnect
+
+
+class Pixy2Supervisor:
+    """ Reconnect and health monitor for Pixy2.
+
+    Call the methods of Pixy2 through call(). When the link with Pixy2 is
+    lost (empty packet, I2C error or max_data_errors wrong packets in a
+    row), the supervisor opens the I2C device again, with a wait between
+    attempts that doubles from backoff_min up to backoff_max. After
+    reconnecting the last mode and lamp state are set again. call() never
+    waits: while reconnecting it returns None at once, so the control loop
+    keeps running and can e.g. stop the motors.
+
+    Keyword arguments:
+    pixy2           -- Pixy2 object to supervise
+    backoff_min     -- wait before first reconnect attempt (ms)
+    backoff_max     -- maximum wait between reconnect attempts (ms)
+    max_data_errors -- wrong packets in a row before link is lost (INT)
+
+    Public methods:
+    call       -- Call a method of Pixy2, None when it failed
+    connected  -- True when link with Pixy2 is up
+    down_time  -- Time since link was lost (ms)
+    """
+    def __init__(self, pixy2, backoff_min=100, backoff_max=2000,
+                 max_data_errors=5):
+        self.pixy2 = pixy2
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.max_data_errors = max_data_errors
+        self.status = PIXY2_OK
+        self._clock = StopWatch()
+        # Statistics
+        self.data_errors = 0
+        self.connection_losses = 0
+        self.reconnect_attempts = 0
+        self.last_recovery_ms = None
+        self.max_recovery_ms = 0
+        self._errors_in_row = 0
+        self._backoff = backoff_min
+        self._lost_at = 0
+        self._next_attempt = 0
+
+    def call(self, method, *args):
+        """ Call method of Pixy2 with args, returns its result or None
+        when Pixy2 isn't connected or returned wrong data."""
+        if self.status == PIXY2_RECONNECTING and not self._reconnect():
+            return None
+        try:
+            result = method(*args)
+        except Pixy2DataError:
+            self.data_errors += 1
+            self._errors_in_row += 1
+            if self._errors_in_row >= self.max_data_errors:
+                self._lost()
+            else:
+                self.status = PIXY2_DEGRADED
+            return None
+        except (Pixy2ConnectionError, OSError):
+            self._lost()
+            return None
+        self._errors_in_row = 0
+        self.status = PIXY2_OK
+        return result
+
+    def connected(self):
+        """ True when link with Pixy2 is up."""
+        return self.status != PIXY2_RECONNECTING
+
+    def down_time(self):
+        """ Time since link was lost (ms), 0 when connected."""
+        if self.status != PIXY2_RECONNECTING:
+            return 0
+        return self._clock.time() - self._lost_at
+
+    def _lost(self):
+        """ Link lost, schedule first reconnect attempt."""
+        self.status = PIXY2_RECONNECTING
+        self.connection_losses += 1
+        self._errors_in_row = 0
+        self._lost_at = self._clock.time()
+        self._backoff = self.backoff_min
+        self._next_attempt = self._lost_at + self._backoff
+
+    def _reconnect(self):
+        """ Try to reconnect when the wait has passed, True on success."""
+        if self._clock.time() < self._next_attempt:
+            return False
+        self.reconnect_attempts += 1
+        pixy2 = self.pixy2
+        try:
+            pixy2.reconnect()
+            # Check link, then restore state of Pixy2
+            pixy2.get_version()
+            if pixy2._mode:
+                pixy2.set_mode(pixy2._mode)
+            if pixy2._lamp is not None:
+                pixy2.set_lamp(*pixy2._lamp)
+        except (Pixy2ConnectionError, Pixy2DataError, OSError):
+            self._backoff = min(2*self._backoff, self.backoff_max)
+            self._next_attempt = self._clock.time() + self._backoff
+            return False
+        self.status = PIXY2_OK
+        self.last_recovery_ms = self._clock.time() - self._lost_at
+        self.max_recovery_ms = max(self.max_recovery_ms,
+                                   self.last_recovery_ms)
+        return True
@@ -0,0 +1,164 @@
+""" pixy2_pybricks.video
+
+Video program of Pixy2: RGB values of single pixels and batched sampling
+of points, grids and regions.
+
+Public classes:
+RGBSampler      -- Batched sampling of video RGB values
+RGBSamples      -- RGB values of sampled pixels
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License : 
+"""
+from .core import check_packet_type, Pixy2DataError
+
+
+def get_rgb(self, x, y, saturate=True):
+    """ Get RGB value (r, g, b) of pixel (x, y) of the video frame.
+
+    When saturate is True the values are scaled so the largest of the
+    three values is 255. Pixy2 must be running the video program.
+    """
+    data = bytes([174, 193, 112, 5, x & 0xff, x >> 8, y & 0xff, y >> 8,
+                  saturate])
+    self.pixy2.write(reg=0x00, data=data)
+    # Read header and result
+    data = self.pixy2.read(reg=0x00, length=10)
+    check_packet_type(data, 1)
+    check_rgb_result(data)
+    return data[8], data[7], data[6]
+
+
+class RGBSampler:
+    """ Batched sampling of RGB values of the video frame.
+
+    The requests for the pixels are sent back to back, reusing one request
+    buffer and one RGBSamples object. The returned RGBSamples object is
+    overwritten by the next call of one of the sample methods.
+
+    Keyword arguments:
+    pixy2      -- Pixy2 object to use
+    saturate   -- scale RGB values so the largest is 255 (bool)
+
+    Public methods:
+    sample_points -- Sample list of (x, y) points
+    sample_grid   -- Sample evenly spaced grid of points
+    sample_region -- Sample every step-th pixel of a rectangular region
+    """
+    def __init__(self, pixy2, saturate=True):
+        self.pixy2 = pixy2
+        self.saturate = saturate
+        self._request = bytearray([174, 193, 112, 5, 0, 0, 0, 0, saturate])
+        self.samples = RGBSamples()
+
+    def sample_points(self, points):
+        """ Sample RGB values of a list of (x, y) points."""
+        samples = self.samples
+        samples.clear()
+        for x, y in points:
+            self._sample(samples, x, y)
+        return samples
+
+    def sample_grid(self, x0, y0, x1, y1, columns, rows):
+        """ Sample grid of columns x rows points, spread evenly between
+        (x0, y0) and (x1, y1) (including both corners)."""
+        samples = self.samples
+        samples.clear()
+        for r in range(rows):
+            y = y0 + (y1-y0)*r//(rows-1) if rows > 1 else y0
+            for c in range(columns):
+                x = x0 + (x1-x0)*c//(columns-1) if columns > 1 else x0
+                self._sample(samples, x, y)
+        return samples
+
+    def sample_region(self, x, y, width, height, step=1):
+        """ Sample every step-th pixel of region with upper left corner
+        (x, y), width and height."""
+        samples = self.samples
+        samples.clear()
+        for py in range(y, y+height, step):
+            for px in range(x, x+width, step):
+                self._sample(samples, px, py)
+        return samples
+
+    def _sample(self, samples, x, y):
+        """ Request RGB value of one pixel and add it to samples."""
+        request = self._request
+        request[4] = x & 0xff
+        request[5] = x >> 8
+        request[6] = y & 0xff
+        request[7] = y >> 8
+        device = self.pixy2.pixy2
+        device.write(reg=0x00, data=request)
+        data = device.read(reg=0x00, length=10)
+        check_packet_type(data, 1)
+        check_rgb_result(data)
+        samples.add(data[8], data[7], data[6])
+
+
+class RGBSamples:
+    """ RGB values of sampled pixels.
+
+    The values are stored in bytearray data as r, g, b of the first pixel,
+    followed by r, g, b of the second pixel and so on.
+    """
+    def __init__(self):
+        self.count = 0
+        self.data = bytearray()
+
+    def add(self, r, g, b):
+        i = 3*self.count
+        if i < len(self.data):
+            # Reuse buffer of previous samples
+            self.data[i] = r
+            self.data[i+1] = g
+            self.data[i+2] = b
+        else:
+            self.data.extend(bytes([r, g, b]))
+        self.count += 1
+
+    def rgb(self, index):
+        """ RGB value (r, g, b) of sample with index."""
+        i = 3*index
+        return self.data[i], self.data[i+1], self.data[i+2]
+
+    def mean(self):
+        """ Mean RGB value (r, g, b) of all samples."""
+        if self.count == 0:
+            return None
+        r = g = b = 0
+        data = self.data
+        for i in range(0, 3*self.count, 3):
+            r += data[i]
+            g += data[i+1]
+            b += data[i+2]
+        return r/self.count, g/self.count, b/self.count
+
+    def histogram(self, bins=8):
+        """ Histograms ([r], [g], [b]) with bins counts per color."""
+        hist_r = [0]*bins
+        hist_g = [0]*bins
+        hist_b = [0]*bins
+        data = self.data
+        for i in range(0, 3*self.count, 3):
+            hist_r[data[i]*bins >> 8] += 1
+            hist_g[data[i+1]*bins >> 8] += 1
+            hist_b[data[i+2]*bins >> 8] += 1
+        return hist_r, hist_g, hist_b
+
+    def clear(self):
+        self.count = 0
+
+    def __str__(self):
+        return 'RGB samples: {}, mean: {}'.format(self.count, self.mean())
+
+
+def check_rgb_result(data):
+    """ Check result of get RGB request, raise exception when negative."""
+    if data[9] & 0x80:
+        # Negative result, e.g. pixel outside the frame
+        msg = 'Could not get RGB value, result: {}'.format(
+              int.from_bytes(data[6:10], 'little') - (1 << 32))
+        raise Pixy2DataError(msg, 'Pixy2DataError')
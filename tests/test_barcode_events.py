@@ -0,0 +1,50 @@
+""" Tests for BarcodeEvents (pixy2_pybricks.line)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pixy2_pybricks.line import Barcode, BarcodeEvents, MainFeatures  # noqa
+
+
+def frame(*codes):
+    """ MainFeatures with a barcode for every code."""
+    mainfeatures = MainFeatures()
+    for code in codes:
+        barcode = Barcode()
+        barcode.code = code
+        mainfeatures.add_barcode(barcode)
+    return mainfeatures
+
+
+def test_raising_handler_doesnt_delay_other_codes():
+    calls = []
+    failures = [2]
+
+    def failing(barcode):
+        calls.append(barcode.code)
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError('I2C error')
+
+    events = BarcodeEvents(confirm=1, cooldown=3)
+    events.on(1, failing)
+    events.on(5, lambda barcode: calls.append(barcode.code))
+    results = []
+    for _ in range(4):
+        try:
+            results.append(events.update(frame(1, 5)))
+        except OSError:
+            results.append('raised')
+    # Code 5 fires in the first frame, code 1 when its handler returns
+    assert results == ['raised', 'raised', 1, 0]
+    assert calls == [1, 5, 1, 1]
+
+
+def test_event_once_per_barcode():
+    calls = []
+    events = BarcodeEvents(confirm=2, cooldown=2)
+    events.on(3, lambda barcode: calls.append(barcode.code))
+    for codes in ((3,), (3,), (3,), (), (), (3,), (3,)):
+        events.update(frame(*codes))
+    assert calls == [3, 3]
@@ -0,0 +1,214 @@
+""" import_bench.py
+
+Import time and heap usage of pixy2_pybricks and its submodules. Runs on
+MicroPython (EV3-brick) and on CPython.
+
+Every step imports one module and prints the time it took and the growth of
+the heap. The totals show what a program pays for the parts it uses, e.g.
+chaser.py loads the core, blocks and supervisor (and latency when
+TRACE_LATENCY is set). Run the benchmark in a new interpreter, modules which
+are already imported cost nothing.
+
+The baselines are versions of the single file pixy2_pybricks.py, saved
+under another name and given as arguments. On CPython without arguments
+they are taken from git: the original file (the commit that added it) and
+the last version before the split into a package (the parent of the commit
+that deleted it), which has the same functions as the package. On CPython
+pybricks is replaced by empty stand-in modules and every module is
+compiled from source (as MicroPython does).
+
+Usage: git show $(git log --diff-filter=D -1 --format=%h \
+           -- pixy2_pybricks.py)^:pixy2_pybricks.py > pixy2_single.py
+       pybricks-micropython tools/import_bench.py pixy2_single.py
+       python tools/import_bench.py [BASELINE ...]
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License :
+"""
+import gc
+import sys
+
+try:
+    # MicroPython
+    from time import ticks_us, ticks_diff
+except ImportError:
+    # CPython
+    from time import perf_counter_ns
+
+    def ticks_us():
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(end, start):
+        return end - start
+
+try:
+    # MicroPython
+    mem_alloc = gc.mem_alloc
+except AttributeError:
+    # CPython
+    import tempfile
+    import tracemalloc
+    tracemalloc.start()
+    # Don't use bytecode compiled by an earlier run
+    sys.pycache_prefix = tempfile.mkdtemp()
+    # The first compile fills caches of the compiler, don't count them
+    compile('class A:\n    def f(self):\n        return [1]\n', 'warm-up',
+            'exec')
+
+    def mem_alloc():
+        return tracemalloc.get_traced_memory()[0]
+
+
+# Import the package of this repository
+parts = __file__.rsplit('/', 1)
+REPO_DIR = (parts[0] if len(parts) == 2 else '.') + '/..'
+sys.path.insert(0, REPO_DIR)
+
+# Baselines from git: label, git log arguments to find the commit and
+# suffix of the commit with the file
+GIT_BASELINES = (('original', ('--diff-filter=A', '--format=%h'), ''),
+                 ('before split', ('--diff-filter=D', '-1', '--format=%h'),
+                  '^'))
+
+STEPS = (('core', 'pixy2_pybricks'),
+         ('settings', 'pixy2_pybricks.settings'),
+         ('blocks', 'pixy2_pybricks.blocks'),
+         ('line', 'pixy2_pybricks.line'),
+         ('video', 'pixy2_pybricks.video'),
+         ('supervisor', 'pixy2_pybricks.supervisor'),
+         ('latency', 'latency'))
+
+PROGRAMS = (('chaser.py', ('core', 'blocks', 'supervisor')),
+            ('linetracker.py', ('core', 'settings', 'line', 'supervisor')),
+            ('all of single file', ('core', 'settings', 'blocks', 'line',
+                                    'video')))
+
+
+def measure(module_name):
+    """ Import module, returns import time (us) and heap growth (bytes)."""
+    gc.collect()
+    memory = mem_alloc()
+    start = ticks_us()
+    __import__(module_name)
+    duration = ticks_diff(ticks_us(), start)
+    gc.collect()
+    return duration, mem_alloc() - memory
+
+
+def install_pybricks():
+    """ Install empty stand-in pybricks modules (CPython), so the modules
+    which import pybricks can be measured."""
+    class Port:
+        S1 = 'S1'
+        S2 = 'S2'
+        S3 = 'S3'
+        S4 = 'S4'
+
+    contents = (('pybricks', {}),
+                ('pybricks.parameters', {'Port': Port}),
+                ('pybricks.iodevices', {'I2CDevice': None}),
+                ('pybricks.tools', {'StopWatch': None}))
+    for name, attributes in contents:
+        module = type(sys)(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+
+
+def git_baselines():
+    """ Returns list with (label, source) of the baselines from git."""
+    import subprocess
+
+    def git(*args):
+        return subprocess.run(('git', '-C', REPO_DIR) + args,
+                              capture_output=True, check=True,
+                              universal_newlines=True).stdout
+
+    baselines = []
+    for label, log_args, suffix in GIT_BASELINES:
+        try:
+            commits = git('log', *log_args, '--', 'pixy2_pybricks.py')
+            if not commits.split():
+                continue
+            # Oldest commit last
+            revision = commits.split()[-1] + suffix
+            source = git('show', revision + ':pixy2_pybricks.py')
+        except (OSError, subprocess.CalledProcessError):
+            continue
+        baselines.append(('pixy2_pybricks.py {} ({})'.format(
+                          label, revision), source))
+    return baselines
+
+
+def baseline_modules():
+    """ Returns list with (label, module name) of the baselines, their
+    directories are added to sys.path."""
+    if sys.implementation.name != 'cpython':
+        modules = []
+        for path in sys.argv[1:]:
+            parts = path.rsplit('/', 1)
+            module_name = parts[-1][:-3] if parts[-1].endswith('.py') \
+                else parts[-1]
+            if module_name == 'pixy2_pybricks':
+                raise SystemExit('Save the baseline under another name, '
+                                 'e.g. pixy2_single.py')
+            sys.path.insert(0, parts[0] if len(parts) == 2 else '.')
+            modules.append((parts[-1], module_name))
+        return modules
+
+    if len(sys.argv) > 1:
+        baselines = []
+        for path in sys.argv[1:]:
+            with open(path) as f:
+                baselines.append((path, f.read()))
+    else:
+        baselines = git_baselines()
+    # Copy to a new directory, so nothing else in it can be imported
+    directory = tempfile.mkdtemp()
+    sys.path.insert(0, directory)
+    modules = []
+    for number, (label, source) in enumerate(baselines):
+        module_name = 'pixy2_baseline{}'.format(number)
+        with open('{}/{}.py'.format(directory, module_name), 'w') as f:
+            f.write(source)
+        modules.append((label, module_name))
+    return modules
+
+
+def main():
+    print('Python: {} {}'.format(sys.implementation.name, sys.version))
+    # pybricks first, so the baselines don't include it
+    steps = [('pybricks', 'pybricks.iodevices')]
+    for label, module_name in baseline_modules():
+        print('Baseline {}: {}'.format(len(steps), label))
+        steps.append(('baseline {}'.format(len(steps)), module_name))
+    print('{:28} {:>10} {:>10}'.format('module', 'time (ms)', 'heap (B)'))
+    results = {}
+    for step, module_name in steps + list(STEPS):
+        try:
+            duration, memory = measure(module_name)
+        except ImportError:
+            if step == 'pybricks':
+                install_pybricks()
+                print('{:28} {:>10}'.format('pybricks', 'stand-in'))
+            else:
+                print('{:28} {:>10}'.format(step, 'n/a'))
+            continue
+        results[step] = (duration, memory)
+        print('{:28} {:10.2f} {:10}'.format(step, duration/1000, memory))
+
+    print()
+    rows = list(PROGRAMS)
+    for step, module_name in steps[1:]:
+        rows.append(('single file, ' + step, (step,)))
+    for program, steps in rows:
+        if not all(step in results for step in steps):
+            print('{:28} {:>10}'.format(program, 'n/a'))
+            continue
+        duration = sum(results[step][0] for step in steps)
+        memory = sum(results[step][1] for step in steps)
+        print('{:28} {:10.2f} {:10}'.format(program, duration/1000, memory))
+
+
+main()
@@ -0,0 +1,275 @@
+""" latency_replay.py
+
+Replay recorded Pixy2 responses through a program (linetracker.py or
+chaser.py) and the pixy2_pybricks library, and measure the latency of the
+control loop with LatencyTracer (latency.py).
+
+A recording holds the responses of Pixy2 to the blocks or linetracking
+requests of a program. It is made by running the program in the simulator
+(see simulator.py), for linetracker.py with rover.SPEED_FAST=400 unless
+--set gives another speed. During replay the unmodified program runs with
+the stand-in pybricks modules of the simulator, but the stand-in Pixy2
+returns the recorded responses and the robot isn't simulated.
+
+The probes are set from outside the library, so any version of
+pixy2_pybricks can be replayed, also the single file of before the split
+into a package: request and parse around get_blocks() and
+get_linetracking_data(), the I2C time in the stand-in I2C device, control
+and motor around the motor commands. So stages 'i2c' and 'parse' show the
+time spent in the library (with a stand-in I2C device that takes almost
+no time), stage 'control' the controller of the program and stage 'motor'
+only the Python overhead of commanding the stand-in motors. When a library
+directory contains the program too (e.g. a checkout of an older version),
+that program is run.
+
+Usage: python tools/latency_replay.py
+       python tools/latency_replay.py --save recording.json
+       python tools/latency_replay.py --load recording.json \
+                                      --library ../old_version --library .
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License :
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+
+import simulator  # noqa: E402
+sys.path.insert(1, REPO_DIR)
+from latency import LatencyTracer, TimedDevice  # noqa: E402
+
+
+# Requests of the control loop and type of their responses
+LOOP_REQUESTS = {32: 'chase', 48: 'line'}
+
+# Methods of Pixy2 of these requests
+LOOP_METHODS = ('get_blocks', 'get_linetracking_data')
+
+
+def record(program, duration, overrides=None):
+    """ Run program in the simulator and record the loop responses.
+
+    Returns dictionary with scenario and list of responses (bytes).
+    """
+    scenario = 'chase' if 'chaser' in program else 'line'
+    sim = simulator.Simulation(scenario=scenario, duration=duration)
+    responses = []
+    handle_request = sim.handle_request
+
+    def recording(request_type, payload):
+        response = handle_request(request_type, payload)
+        if request_type in LOOP_REQUESTS:
+            responses.append(response)
+        return response
+
+    sim.handle_request = recording
+    result = simulator.run_program(program, sim, overrides)
+    if result['outcome'] != 'completed':
+        print('Warning: recording ended with outcome {}'.format(
+              result['outcome']))
+    return {'program': os.path.basename(program), 'scenario': scenario,
+            'responses': responses}
+
+
+def save(recording, path):
+    with open(path, 'w') as f:
+        json.dump({'program': recording['program'],
+                   'scenario': recording['scenario'],
+                   'responses': [r.hex() for r in recording['responses']]},
+                  f)
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {'program': data['program'],
+            'scenario': data['scenario'],
+            'responses': [bytes.fromhex(r) for r in data['responses']]}
+
+
+class ReplaySimulation(simulator.Simulation):
+    """ Simulation which answers the loop requests of the program with the
+    responses of a recording, until loops requests are answered. The robot
+    isn't simulated, so the stand-in devices take little time.
+
+    Keyword arguments:
+    recording -- recording made by record()
+    loops     -- number of loops to replay
+    """
+    def __init__(self, recording, loops):
+        super().__init__(scenario=recording['scenario'],
+                         duration=float('inf'))
+        self._responses = recording['responses']
+        self._loops = loops
+
+    def advance(self, dt):
+        self.time += dt
+
+    def handle_request(self, request_type, payload):
+        if request_type not in LOOP_REQUESTS:
+            return super().handle_request(request_type, payload)
+        responses = self._responses
+        response = responses[self.frames_requested % len(responses)]
+        self.frames_requested += 1
+        if self.frames_requested >= self._loops:
+            # Stop the program, it reacts to a button press
+            self.outcome = 'completed'
+        return response
+
+
+class ProbedMotor:
+    """ Motor which sets the control probe of tracer before the first
+    command after a request, and the motor probe after every command."""
+    # Loop of the last command, shared by the motors
+    loop = 0
+
+    def __init__(self, motor, tracer):
+        self._motor = motor
+        self._tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self._motor, name)
+
+    def _control(self):
+        if ProbedMotor.loop != self._tracer.loops:
+            ProbedMotor.loop = self._tracer.loops
+            self._tracer.control()
+
+    def run(self, speed):
+        self._control()
+        self._motor.run(speed)
+        self._tracer.motor()
+
+    def stop(self):
+        self._control()
+        self._motor.stop()
+        self._tracer.motor()
+
+
+def install_probes(tracer):
+    """ Set the probes of tracer from outside the library, so every version
+    of pixy2_pybricks can be replayed: request and parse around the loop
+    methods of Pixy2, I2C time in the stand-in I2C device, control and
+    motor around the commands to the stand-in motors."""
+    iodevices = sys.modules['pybricks.iodevices']
+    ev3devices = sys.modules['pybricks.ev3devices']
+    sim_i2c_device = iodevices.I2CDevice
+    sim_motor = ev3devices.Motor
+
+    def I2CDevice(port, address):
+        return TimedDevice(sim_i2c_device(port, address), tracer)
+
+    def Motor(port, *args, **kwargs):
+        return ProbedMotor(sim_motor(port, *args, **kwargs), tracer)
+
+    iodevices.I2CDevice = I2CDevice
+    ev3devices.Motor = Motor
+    ProbedMotor.loop = 0
+
+    # Instance attributes, so the methods stay probed when a version of the
+    # library replaces its methods in the class
+    pixy2_class = importlib.import_module('pixy2_pybricks').Pixy2
+    init = pixy2_class.__init__
+
+    def probed(pixy2, name):
+        def method(*args):
+            tracer.request()
+            result = getattr(pixy2_class, name)(pixy2, *args)
+            tracer.parse()
+            return result
+        return method
+
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        for name in LOOP_METHODS:
+            setattr(self, name, probed(self, name))
+
+    pixy2_class.__init__ = __init__
+
+
+def replay(library_dir, program, recording, loops):
+    """ Run program against recording with pixy2_pybricks of library_dir,
+    returns LatencyTracer and simulation report. When library_dir has a
+    program with the same name, that program is run."""
+    library_dir = os.path.abspath(library_dir)
+    own_program = os.path.join(library_dir, os.path.basename(program))
+    if os.path.exists(own_program):
+        program = own_program
+    tracer = LatencyTracer(capacity=loops)
+    sys.path.insert(0, library_dir)
+    try:
+        sim = ReplaySimulation(recording, loops)
+        result = simulator.run_program(
+            program, sim, setup=lambda: install_probes(tracer))
+    finally:
+        sys.path.remove(library_dir)
+    result['program'] = program
+    return tracer, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure control loop latency by replaying Pixy2 '
+                    'responses.')
+    parser.add_argument('--program',
+                        help='program to record and replay (default: '
+                             'linetracker.py, or program of --load)')
+    parser.add_argument('--duration', type=float, default=20,
+                        help='simulated seconds to record (default 20)')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='MODULE.NAME=VALUE',
+                        help='override constant while recording (default '
+                             'for linetracker.py: rover.SPEED_FAST=400)')
+    parser.add_argument('--save', help='save recording to file')
+    parser.add_argument('--load', help='load recording from file')
+    parser.add_argument('--library', action='append',
+                        help='directory with pixy2_pybricks to measure, '
+                             'repeat to compare versions (default: repo), '
+                             'its own program is used when it has one')
+    parser.add_argument('--loops', type=int, default=5000,
+                        help='number of loops to replay (default 5000)')
+    args = parser.parse_args()
+
+    if args.load:
+        recording = load(args.load)
+        program = args.program or os.path.join(REPO_DIR,
+                                               recording['program'])
+    else:
+        program = args.program or os.path.join(REPO_DIR, 'linetracker.py')
+        overrides = dict(simulator.parse_override(t) for t in args.set)
+        if 'chaser' not in program:
+            # SPEED_FAST is 0 in rover.py, record a driving rover
+            overrides.setdefault('rover.SPEED_FAST', 400)
+        recording = record(program, args.duration, overrides)
+    if not recording['responses']:
+        sys.exit('Recording contains no responses')
+    if args.save:
+        save(recording, args.save)
+    print('Recording: {}, {} scenario, {} responses\n'.format(
+          recording['program'], recording['scenario'],
+          len(recording['responses'])))
+
+    # rover.py is found in the directory of the program, behind the
+    # library directory of replay()
+    sys.path.append(os.path.dirname(os.path.abspath(program)))
+    for library_dir in args.library or [REPO_DIR]:
+        print('Library: {}'.format(os.path.abspath(library_dir)))
+        tracer, result = replay(library_dir, program, recording, args.loops)
+        print('Program: {}'.format(result['program']))
+        if result['outcome'] != 'completed':
+            print('Replay ended with outcome {}'.format(result['outcome']))
+        print('Loops per second: {}'.format(result['wall_loop_rate_hz']))
+        tracer.print_summary()
+        print()
+
+
+if __name__ == '__main__':
+    main()
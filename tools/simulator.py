@@ -0,0 +1,876 @@
+""" simulator.py
+
+Headless 2D simulator for the Pixy2 demo programs. It runs the real
+programs (linetracker.py, chaser.py, main.py) on a desktop computer with
+CPython, without EV3-brick or Pixy2 camera.
+
+The simulator installs stand-in `pybricks` modules. The motors of the robot
+are modelled as a differential drive, the Pixy2 camera is modelled as an
+I2C device which renders a virtual track (linetracking) or a moving target
+(color connected components) into the packets a real Pixy2 would send. The
+programs use the unmodified `pixy2_pybricks` module to parse those packets.
+
+Time is simulated: every I2C transaction, motor command and beep advances
+the simulation clock by a modelled duration, so the simulation runs as fast
+as the computer can go instead of in real time.
+
+Usage: python tools/simulator.py linetracker.py --set rover.SPEED_FAST=400
+       python tools/simulator.py chaser.py --scenario chase
+
+       rover.SPEED_FAST is 0 in rover.py, set it to let linetracker.py
+       drive. After the run a benchmark report is printed with the loop
+       rate, lap times and cross-track error of the robot. The outcome is
+       'stalled' when the robot didn't move along the track.
+
+
+Date    : Oct 19 2026
+Version : 1.00
+License :
+"""
+import argparse
+import ast
+import builtins
+import importlib
+import json
+import math
+import os
+import sys
+import time
+import types
+
+
+# Timing model of the hardware (seconds)
+I2C_TRANSACTION_TIME = 0.0008   # Fixed cost of one I2C read or write
+I2C_BYTE_TIME = 0.00009         # Cost per transferred byte (100 kHz)
+MOTOR_COMMAND_TIME = 0.0002     # Cost of Motor.run() or Motor.stop()
+BUTTON_POLL_TIME = 0.0001       # Cost of EV3Brick.buttons.pressed()
+SUBSTEP = 0.002                 # Integration step for the kinematics
+
+# Robot geometry (mm) and motor model
+WHEEL_DIAMETER = 56
+AXLE_TRACK = 120
+MOTOR_MAX_SPEED = 1050          # deg/s
+MOTOR_TIME_CONSTANT = 0.05      # s
+
+# Pixy2 camera model
+FRAME_RATE = 60                          # frames per second
+LINE_RESOLUTION = (79, 52)               # Resolution of line program
+CCC_RESOLUTION = (316, 208)              # Resolution of ccc program
+LINE_VIEW = (40, 240, 110)               # Near, far, half width (mm)
+LINE_WIDTH = 20                          # mm
+FLOOR_RGB = (200, 190, 180)
+LINE_RGB = (30, 30, 40)
+CCC_FOCAL_LENGTH = 274                   # Pixels, 60 degrees field of view
+CCC_CAMERA_HEIGHT = 100                  # mm
+TARGET_DIAMETER = 60                     # mm
+
+# Pixy2 line feature flags
+LINE_FLAG_INTERSECTION_PRESENT = 0x04
+
+# Robot is lost when it is further than this from the track (mm)
+LOST_DISTANCE = 250
+
+# Robot is stalled when it moves less than STALL_DISTANCE (mm) along the
+# track in STALL_TIME (s)
+STALL_DISTANCE = 50
+STALL_TIME = 5.0
+
+
+class Track:
+    """ Closed track, resampled to points with equal spacing.
+
+    Keyword arguments:
+    points     -- list with (x, y) corner points of the track (mm)
+    spacing    -- distance between resampled points (mm)
+    junctions  -- list with (s, branch angles) of intersections, s is
+                  the distance along the track (mm)
+    barcodes   -- list with (s, lateral offset, code) of barcodes
+    """
+    def __init__(self, points, spacing=5, junctions=(), barcodes=()):
+        self.spacing = spacing
+        self.points = []
+        self.headings = []
+        n = len(points)
+        for i in range(n):
+            x0, y0 = points[i]
+            x1, y1 = points[(i+1) % n]
+            length = math.hypot(x1-x0, y1-y0)
+            heading = math.atan2(y1-y0, x1-x0)
+            steps = max(1, int(round(length/spacing)))
+            for j in range(steps):
+                f = j/steps
+                self.points.append((x0 + f*(x1-x0), y0 + f*(y1-y0)))
+                self.headings.append(heading)
+        self.length = len(self.points)*spacing
+        self.junctions = list(junctions)
+        self.barcodes = list(barcodes)
+
+    def point_at(self, s):
+        """ Point on the track at distance s along the track."""
+        return self.points[int(s/self.spacing) % len(self.points)]
+
+    def closest(self, x, y, hint=None, window=60):
+        """ Index of and distance to the point closest to (x, y).
+
+        When hint is given, only the points within window of the hint are
+        searched.
+        """
+        n = len(self.points)
+        if hint is None:
+            indices = range(n)
+        else:
+            indices = (i % n for i in range(hint-window, hint+window+1))
+        best_index = 0
+        best_distance = None
+        for i in indices:
+            px, py = self.points[i]
+            d = (px-x)*(px-x) + (py-y)*(py-y)
+            if best_distance is None or d < best_distance:
+                best_index = i
+                best_distance = d
+        return best_index, math.sqrt(best_distance)
+
+
+def oval_track(straight=1000, radius=300):
+    """ Oval track with an intersection and barcodes on the straights."""
+    # Start halfway the lower straight, drive counterclockwise
+    points = [(straight/2, -radius)]
+    for i in range(37):
+        a = -math.pi/2 + math.pi*i/36
+        points.append((straight + radius*math.cos(a), radius*math.sin(a)))
+    for i in range(37):
+        a = math.pi/2 + math.pi*i/36
+        points.append((radius*math.cos(a), radius*math.sin(a)))
+    half_lap = straight + math.pi*radius
+    return Track(points,
+                 junctions=[(straight/2 + half_lap, (0, 90, -90))],
+                 barcodes=[(straight/4, 60, 1), (straight/4 + half_lap, 60, 5)])
+
+
+def circle_track(radius=500):
+    """ Circular track without intersections or barcodes."""
+    points = []
+    for i in range(72):
+        a = -math.pi/2 + 2*math.pi*i/72
+        points.append((radius*math.cos(a), radius + radius*math.sin(a)))
+    return Track(points)
+
+
+TRACKS = {
+    'oval': oval_track,
+    'circle': circle_track,
+}
+
+
+class SimMotor:
+    """ Stand-in for pybricks.ev3devices.Motor."""
+    def __init__(self, sim, port):
+        self._sim = sim
+        self.port = port
+        self.target = 0
+        self.actual = 0
+        self.angle_deg = 0
+        sim.motors[port] = self
+
+    def run(self, speed):
+        self._sim.advance(MOTOR_COMMAND_TIME)
+        self._sim.motor_commands += 1
+        self.target = max(-MOTOR_MAX_SPEED, min(MOTOR_MAX_SPEED, speed))
+
+    def stop(self):
+        self._sim.advance(MOTOR_COMMAND_TIME)
+        self._sim.motor_commands += 1
+        self.target = 0
+
+    def brake(self):
+        self.stop()
+
+    def hold(self):
+        self.stop()
+
+    def speed(self):
+        return int(self.actual)
+
+    def angle(self):
+        return int(self.angle_deg)
+
+    def reset_angle(self, angle=0):
+        self.angle_deg = angle
+
+    def step(self, dt):
+        """ Update speed (first order lag) and angle of the motor."""
+        self.actual += (self.target-self.actual) * (
+            1 - math.exp(-dt/MOTOR_TIME_CONSTANT))
+        self.angle_deg += self.actual*dt
+
+
+class SimPixy2:
+    """ Stand-in for pybricks.iodevices.I2CDevice with a Pixy2 behind it.
+
+    Every write is decoded as a Pixy2 request and the complete response is
+    queued, following reads return consecutive bytes of that response.
+    """
+    def __init__(self, sim, port, address):
+        self._sim = sim
+        self.port = port
+        self.address = address
+        self._response = b''
+        self._position = 0
+
+    def write(self, reg=0x00, data=b''):
+        sim = self._sim
+        sim.transfer(len(data))
+        if sim.disconnected:
+            self._response = b''
+            self._position = 0
+            return
+        data = bytes(data)
+        if len(data) < 4 or data[0] != 174 or data[1] != 193:
+            self._response = packet(3, bytes([0xff]))
+        else:
+            self._response = sim.handle_request(data[2],
+                                                data[4:4+data[3]])
+        self._position = 0
+
+    def read(self, reg=0x00, length=1):
+        self._sim.transfer(length)
+        start = self._position
+        data = self._response[start:start+length]
+        self._position = start + length
+        if len(data) < length:
+            # Nothing more to send, Pixy2 returns zeros
+            data += bytes(length - len(data))
+        return data
+
+
+def packet(packet_type, payload):
+    """ Pixy2 response packet: sync, type, length, checksum and payload."""
+    checksum = sum(payload) & 0xffff
+    return bytes([175, 193, packet_type, len(payload),
+                  checksum & 0xff, checksum >> 8]) + bytes(payload)
+
+
+def result_packet(value):
+    """ Pixy2 result packet (type 1) with a signed 32 bit value."""
+    return packet(1, value.to_bytes(4, 'little', signed=True))
+
+
+class Simulation:
+    """ Simulated world: robot, camera and track or target.
+
+    Keyword arguments:
+    scenario    -- 'line' for a track to follow, 'chase' for a moving target
+    track       -- Track to follow or to move the target along
+    duration    -- maximum simulated time (s)
+    laps        -- stop after this number of laps (0 for no limit)
+    target_speed-- speed of the target in scenario 'chase' (mm/s)
+    target_lead -- starting distance of target in front of robot (mm)
+    left_port   -- port letter of left motor
+    right_port  -- port letter of right motor
+    dropouts    -- list with (start, duration) in s of lost links with
+                   Pixy2, Pixy2 restarts when the link is back
+    """
+    def __init__(self, scenario='line', track=None, duration=30, laps=0,
+                 target_speed=120, target_lead=450,
+                 left_port='B', right_port='C', dropouts=()):
+        self.scenario = scenario
+        self.track = track if track is not None else oval_track()
+        self.duration = duration
+        self.laps_limit = laps
+        self.target_speed = target_speed
+        self.target_lead = target_lead
+        self.left_port = left_port
+        self.right_port = right_port
+        if scenario == 'line':
+            self.resolution = LINE_RESOLUTION
+        else:
+            self.resolution = CCC_RESOLUTION
+
+        # Robot pose at start of track
+        self.x, self.y = self.track.points[0]
+        self.heading = self.track.headings[0]
+        self.motors = {}
+
+        # Clock and counters
+        self.time = 0.0
+        self.disconnected = False
+        self.dropouts = sorted(dropouts)
+        self.recovery_times = []
+        self._restored_at = None
+        self.lamp = (0, 0)
+        self.mode = 0
+        self.outcome = None
+        self.i2c_transactions = 0
+        self.i2c_bytes = 0
+        self.frames_requested = 0
+        self.motor_commands = 0
+        self.requests = {}
+
+        # Metrics
+        self._index, distance = self.track.closest(self.x, self.y)
+        self.progress = 0.0
+        self._stall_time = 0.0
+        self._stall_progress = 0.0
+        self.lap_times = []
+        self.error_time = 0.0
+        self.error_abs = 0.0
+        self.error_sq = 0.0
+        self.error_max = 0.0
+        self.range_sum = 0.0
+        self._frame = None
+        self._frame_cache = {}
+
+    # Clock
+
+    def transfer(self, nr_bytes):
+        """ Advance clock for one I2C transaction of nr_bytes."""
+        self.i2c_transactions += 1
+        self.i2c_bytes += nr_bytes
+        self.advance(I2C_TRANSACTION_TIME + nr_bytes*I2C_BYTE_TIME)
+
+    def advance(self, dt):
+        """ Advance simulated time with dt seconds."""
+        while dt > 0:
+            step = min(dt, SUBSTEP)
+            self._step(step)
+            dt -= step
+        self._update_link()
+        if self.time >= self.duration and self.outcome is None:
+            self.outcome = 'completed'
+
+    def _update_link(self):
+        """ Disconnect Pixy2 during dropouts, restart it afterwards."""
+        disconnected = False
+        for start, duration in self.dropouts:
+            if start <= self.time < start + duration:
+                disconnected = True
+        if disconnected and not self.disconnected:
+            # Pixy2 loses power, it starts with default settings
+            self.lamp = (0, 0)
+            self.mode = 0
+        elif self.disconnected and not disconnected:
+            self._restored_at = self.time
+        self.disconnected = disconnected
+
+    @property
+    def done(self):
+        """ True when the program should stop."""
+        return self.outcome is not None
+
+    def _step(self, dt):
+        """ Integrate motors, kinematics and metrics over dt."""
+        left = self.motors.get(self.left_port)
+        right = self.motors.get(self.right_port)
+        for motor in self.motors.values():
+            motor.step(dt)
+        # Wheel speeds in mm/s
+        k = math.pi*WHEEL_DIAMETER/360
+        v_left = left.actual*k if left else 0
+        v_right = right.actual*k if right else 0
+        v = (v_left+v_right) / 2
+        w = (v_right-v_left) / AXLE_TRACK
+        if abs(w) < 1e-9:
+            self.x += v*dt*math.cos(self.heading)
+            self.y += v*dt*math.sin(self.heading)
+        else:
+            r = v/w
+            new_heading = self.heading + w*dt
+            self.x += r*(math.sin(new_heading) - math.sin(self.heading))
+            self.y -= r*(math.cos(new_heading) - math.cos(self.heading))
+            self.heading = new_heading
+        self.time += dt
+        self._measure(dt)
+
+    def _measure(self, dt):
+        """ Update progress, laps and error metrics."""
+        track = self.track
+        n = len(track.points)
+        index, distance = track.closest(self.x, self.y, self._index)
+        delta = (index-self._index+n//2) % n - n//2
+        self._index = index
+        self.progress += delta*track.spacing
+        if self.scenario == 'line':
+            error = distance
+            if self.progress >= (len(self.lap_times)+1)*track.length:
+                self.lap_times.append(self.time)
+                if self.laps_limit and len(self.lap_times) >= self.laps_limit:
+                    self.outcome = self.outcome or 'completed'
+            if distance > LOST_DISTANCE:
+                self.outcome = self.outcome or 'lost'
+            if self.time >= self._stall_time + STALL_TIME:
+                if self.progress - self._stall_progress < STALL_DISTANCE:
+                    self.outcome = self.outcome or 'stalled'
+                self._stall_time = self.time
+                self._stall_progress = self.progress
+        else:
+            forward, lateral = self.to_robot(*self.target_position())
+            self.range_sum += math.hypot(forward, lateral)*dt
+            error = lateral
+        self.error_time += dt
+        self.error_abs += abs(error)*dt
+        self.error_sq += error*error*dt
+        self.error_max = max(self.error_max, abs(error))
+
+    # Geometry
+
+    def to_robot(self, x, y):
+        """ Transform world coordinates to (forward, left) of robot."""
+        dx = x - self.x
+        dy = y - self.y
+        c = math.cos(self.heading)
+        s = math.sin(self.heading)
+        return dx*c + dy*s, -dx*s + dy*c
+
+    def target_position(self):
+        """ Position of target moving along the track."""
+        s = self.target_lead + self.target_speed*self.time
+        return self.track.point_at(s)
+
+    def line_image(self, forward, lateral):
+        """ Line image coordinates of a floor point, None when not in view."""
+        near, far, half_width = LINE_VIEW
+        if not near <= forward <= far or abs(lateral) > half_width:
+            return None
+        width, height = LINE_RESOLUTION
+        x = int(round((0.5 - lateral/(2*half_width)) * (width-1)))
+        y = int(round((far-forward)/(far-near) * (height-1)))
+        return x, y
+
+    # Pixy2
+
+    def handle_request(self, request_type, payload):
+        """ Build response packet for a Pixy2 request."""
+        self.requests[request_type] = self.requests.get(request_type, 0) + 1
+        if request_type == 14:
+            # Version
+            data = bytes([0x22, 0x00, 3, 0, 11, 0]) + b'general'
+            return packet(15, data + bytes(16-len(data)))
+        elif request_type == 12:
+            width, height = self.resolution
+            return packet(13, width.to_bytes(2, 'little') +
+                              height.to_bytes(2, 'little'))
+        elif request_type == 22 and len(payload) == 2:
+            self.lamp = (payload[0], payload[1])
+            return result_packet(0)
+        elif request_type == 54 and len(payload) == 1:
+            self.mode = payload[0]
+            return result_packet(0)
+        elif request_type in (56, 58, 60):
+            # Vector, next turn, default turn
+            return result_packet(0)
+        elif request_type == 32:
+            self.loop_request()
+            return packet(33, self.frame(32, payload, self.render_blocks))
+        elif request_type == 48:
+            self.loop_request()
+            return packet(49, self.frame(48, payload, self.render_line))
+        elif request_type == 112 and len(payload) == 5:
+            return self.render_rgb(payload)
+        # Unknown request, error packet
+        return packet(3, bytes([0xff]))
+
+    def loop_request(self):
+        """ Count loop, measure recovery after a dropout."""
+        self.frames_requested += 1
+        if self._restored_at is not None:
+            self.recovery_times.append(round(self.time-self._restored_at, 3))
+            self._restored_at = None
+
+    def frame(self, request_type, payload, render):
+        """ Rendered payload, updated once per camera frame."""
+        frame = int(self.time*FRAME_RATE)
+        if frame != self._frame:
+            self._frame = frame
+            self._frame_cache = {}
+        key = (request_type, bytes(payload))
+        if key not in self._frame_cache:
+            self._frame_cache[key] = render(payload)
+        return self._frame_cache[key]
+
+    def render_line(self, payload):
+        """ Main features (vector, intersections, barcodes) of the track."""
+        if self.scenario != 'line':
+            return b''
+        track = self.track
+        n = len(track.points)
+        features = payload[1] if len(payload) > 1 else 7
+        # First run of track points in view, in driving direction
+        view = []
+        for i in range(self._index-20, self._index+120):
+            pixel = self.line_image(*self.to_robot(*track.points[i % n]))
+            if pixel is not None:
+                view.append((i, pixel))
+            elif view:
+                break
+        data = b''
+        if len(view) < 2:
+            return data
+        first_s = view[0][0]*track.spacing
+        last_s = view[-1][0]*track.spacing
+        flags = 0
+        intersections = b''
+        for s, angles in track.junctions:
+            # Junction in view, also for lap wrapped positions
+            s += track.length*round((first_s-s)/track.length)
+            if first_s <= s <= last_s:
+                pixel = self.line_image(*self.to_robot(*track.point_at(s)))
+                if pixel is None:
+                    continue
+                flags |= LINE_FLAG_INTERSECTION_PRESENT
+                branches = b''
+                for index, angle in enumerate(angles):
+                    branches += bytes([index, 0]) + angle.to_bytes(
+                        2, 'little', signed=True)
+                intersections += bytes([2, 4+len(branches), pixel[0],
+                                        pixel[1], len(angles), 0]) + branches
+        if features & 1:
+            x0, y0 = view[0][1]
+            x1, y1 = view[-1][1]
+            data += bytes([1, 6, x0, y0, x1, y1, 1, flags])
+        if features & 2:
+            data += intersections
+        if features & 4:
+            for s, offset, code in track.barcodes:
+                i = int(s/track.spacing) % n
+                x, y = track.points[i]
+                heading = track.headings[i]
+                x -= offset*math.sin(heading)
+                y += offset*math.cos(heading)
+                pixel = self.line_image(*self.to_robot(x, y))
+                if pixel is not None:
+                    data += bytes([4, 4, pixel[0], pixel[1], 0, code])
+        return data
+
+    def render_rgb(self, payload):
+        """ Result packet with floor color (b, g, r) of a video pixel."""
+        x = payload[0] | payload[1] << 8
+        y = payload[2] | payload[3] << 8
+        width, height = CCC_RESOLUTION
+        if x >= width or y >= height:
+            return result_packet(-1)
+        rgb = FLOOR_RGB
+        if self.scenario == 'line':
+            # Video frame sees the same part of the floor as line program
+            near, far, half_width = LINE_VIEW
+            forward = far - (far-near)*y/(height-1)
+            lateral = (0.5 - x/(width-1)) * 2*half_width
+            c = math.cos(self.heading)
+            s = math.sin(self.heading)
+            px = self.x + forward*c - lateral*s
+            py = self.y + forward*s + lateral*c
+            index, distance = self.track.closest(px, py, self._index, 80)
+            if distance <= LINE_WIDTH/2:
+                rgb = LINE_RGB
+        if payload[4]:
+            # Saturate, scale largest value to 255
+            scale = 255/max(rgb)
+            rgb = [int(v*scale) for v in rgb]
+        r, g, b = rgb
+        return packet(1, bytes([b, g, r, 0]))
+
+    def render_blocks(self, payload):
+        """ Block of the target (signature 1) when in view."""
+        sigmap = payload[0] if payload else 255
+        max_blocks = payload[1] if len(payload) > 1 else 255
+        if self.scenario != 'chase' or not sigmap & 1 or max_blocks < 1:
+            return b''
+        forward, lateral = self.to_robot(*self.target_position())
+        if forward < 50:
+            return b''
+        width, height = CCC_RESOLUTION
+        x = int(round(width/2 - CCC_FOCAL_LENGTH*lateral/forward))
+        y = int(round(height/2 + CCC_FOCAL_LENGTH *
+                      (CCC_CAMERA_HEIGHT-TARGET_DIAMETER/2)/forward))
+        size = max(1, int(round(CCC_FOCAL_LENGTH*TARGET_DIAMETER/forward)))
+        if not 0 <= x < width or not 0 <= y < height:
+            return b''
+        values = (1, x, y, size, size, 0)
+        data = b''.join(v.to_bytes(2, 'little', signed=True) for v in values)
+        return data + bytes([1, min(255, self._frame or 0)])
+
+    # Results
+
+    def report(self, wall_time):
+        """ Benchmark results as a dictionary."""
+        sim_time = self.time
+        result = {
+            'scenario': self.scenario,
+            'outcome': self.outcome or 'stopped',
+            'sim_time_s': round(sim_time, 3),
+            'wall_time_s': round(wall_time, 3),
+            'speedup': round(sim_time/wall_time, 1) if wall_time else None,
+            'loops': self.frames_requested,
+            'loop_rate_hz': round(self.frames_requested/sim_time, 1)
+                            if sim_time else 0,
+            'wall_loop_rate_hz': round(self.frames_requested/wall_time, 1)
+                                 if wall_time else None,
+            'i2c_transactions': self.i2c_transactions,
+            'i2c_bytes': self.i2c_bytes,
+            'motor_commands': self.motor_commands,
+        }
+        if self.dropouts:
+            result['dropouts'] = len(self.dropouts)
+            result['recovery_s'] = self.recovery_times
+            result['lamp'] = self.lamp
+        if self.error_time:
+            mean = self.error_abs/self.error_time
+            rms = math.sqrt(self.error_sq/self.error_time)
+        else:
+            mean = rms = 0
+        if self.scenario == 'line':
+            laps = []
+            last = 0.0
+            for t in self.lap_times:
+                laps.append(round(t-last, 3))
+                last = t
+            result['laps'] = len(laps)
+            result['lap_times_s'] = laps
+            result['distance_mm'] = round(self.progress)
+            if self.progress >= STALL_DISTANCE:
+                # Cross-track error of a robot standing still means nothing
+                result['cross_track_mean_mm'] = round(mean, 1)
+                result['cross_track_rms_mm'] = round(rms, 1)
+                result['cross_track_max_mm'] = round(self.error_max, 1)
+        else:
+            result['range_mean_mm'] = round(
+                self.range_sum/self.error_time, 1) if self.error_time else 0
+            result['lateral_mean_mm'] = round(mean, 1)
+            result['lateral_rms_mm'] = round(rms, 1)
+            result['lateral_max_mm'] = round(self.error_max, 1)
+        return result
+
+
+# Stand-in pybricks modules
+
+def install(sim):
+    """ Install stand-in pybricks modules for sim in sys.modules."""
+    class Port:
+        A = 'A'
+        B = 'B'
+        C = 'C'
+        D = 'D'
+        S1 = 'S1'
+        S2 = 'S2'
+        S3 = 'S3'
+        S4 = 'S4'
+
+    class Button:
+        CENTER = 'CENTER'
+        LEFT = 'LEFT'
+        RIGHT = 'RIGHT'
+        UP = 'UP'
+        DOWN = 'DOWN'
+
+    class Buttons:
+        def pressed(self):
+            sim.advance(BUTTON_POLL_TIME)
+            return [Button.CENTER] if sim.done else []
+
+    class Speaker:
+        def beep(self, frequency=500, duration=100):
+            sim.advance(duration/1000)
+
+        def say(self, text):
+            pass
+
+    class Screen:
+        def clear(self):
+            pass
+
+        def print(self, *args, **kwargs):
+            pass
+
+        def draw_text(self, *args, **kwargs):
+            pass
+
+    class Light:
+        def on(self, color=None):
+            pass
+
+        def off(self):
+            pass
+
+    class EV3Brick:
+        def __init__(self):
+            self.buttons = Buttons()
+            self.speaker = Speaker()
+            self.screen = Screen()
+            self.light = Light()
+
+    def Motor(port, *args, **kwargs):
+        return SimMotor(sim, port)
+
+    def I2CDevice(port, address):
+        return SimPixy2(sim, port, address)
+
+    def wait(time):
+        sim.advance(time/1000)
+
+    class StopWatch:
+        def __init__(self):
+            self._start = sim.time
+
+        def time(self):
+            return int((sim.time-self._start)*1000)
+
+        def reset(self):
+            self._start = sim.time
+
+    contents = {
+        'pybricks': {},
+        'pybricks.hubs': {'EV3Brick': EV3Brick},
+        'pybricks.ev3devices': {'Motor': Motor},
+        'pybricks.parameters': {'Port': Port, 'Button': Button},
+        'pybricks.iodevices': {'I2CDevice': I2CDevice},
+        'pybricks.tools': {'wait': wait, 'StopWatch': StopWatch},
+    }
+    for name, attributes in contents.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        if name == 'pybricks':
+            module.__path__ = []
+        else:
+            setattr(sys.modules['pybricks'], name.split('.')[1], module)
+        sys.modules[name] = module
+
+
+def program_code(path, constants):
+    """ Compile program at path with constants replaced.
+
+    Keyword arguments:
+    path      -- path of program (e.g. chaser.py)
+    constants -- dictionary {'NAME': value}, every assignment NAME = ...
+                 in the program (also inside functions) gets value
+
+    Raises ValueError when the program doesn't assign a NAME.
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    found = set()
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id in constants):
+            name = node.targets[0].id
+            node.value = ast.copy_location(ast.Constant(constants[name]),
+                                           node.value)
+            found.add(name)
+    missing = sorted(set(constants) - found)
+    if missing:
+        raise ValueError('{} has no constant {}'.format(
+                         os.path.basename(path), ', '.join(missing)))
+    return compile(tree, path, 'exec')
+
+
+def run_program(path, sim, overrides=None, setup=None):
+    """ Run program at path against sim, returns benchmark report.
+
+    Keyword arguments:
+    path      -- path of program (e.g. linetracker.py)
+    sim       -- Simulation to run the program in
+    overrides -- dictionary {'module.NAME': value} of constants to set
+                 before the program starts, module is an imported module
+                 (e.g. rover) or the program itself (e.g. chaser)
+    setup     -- function called after the stand-in modules are installed,
+                 before the program starts
+
+    Raises ValueError when the program has no constant to override.
+    """
+    program_dir = os.path.dirname(os.path.abspath(path))
+    if program_dir not in sys.path:
+        sys.path.insert(0, program_dir)
+    program_name = os.path.splitext(os.path.basename(path))[0]
+    constants = {}
+    for key, value in (overrides or {}).items():
+        module_name, attribute = key.rsplit('.', 1)
+        if module_name == program_name:
+            # Importing the program would run it, change its source instead
+            constants[attribute] = value
+    code = program_code(path, constants)
+
+    # Forget modules of a previous run, they are bound to another sim
+    for name in list(sys.modules):
+        if name.split('.')[0] in ('pybricks', 'pixy2_pybricks', 'rover'):
+            del sys.modules[name]
+    install(sim)
+    for key, value in (overrides or {}).items():
+        module_name, attribute = key.rsplit('.', 1)
+        if module_name != program_name:
+            setattr(importlib.import_module(module_name), attribute, value)
+    if setup is not None:
+        setup()
+
+    start = time.perf_counter()
+    try:
+        exec(code, {'__name__': '__main__', '__file__': path,
+                    '__builtins__': builtins})
+    except SystemExit:
+        pass
+    except Exception as error:
+        sim.outcome = 'error: {!r}'.format(error)
+    wall_time = time.perf_counter() - start
+
+    result = sim.report(wall_time)
+    result['program'] = os.path.basename(path)
+    return result
+
+
+def parse_override(text):
+    """ Parse 'module.NAME=value' into key and value, value is a Python
+    literal (e.g. 400, 0.5, True) when possible, else a string."""
+    key, value = text.split('=', 1)
+    try:
+        return key, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return key, value
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run a Pixy2 program in the headless simulator.')
+    parser.add_argument('program', help='program to run, e.g. linetracker.py')
+    parser.add_argument('--scenario', choices=('line', 'chase'),
+                        help='default: chase for chaser.py, else line')
+    parser.add_argument('--track', choices=sorted(TRACKS), default='oval')
+    parser.add_argument('--duration', type=float, default=30,
+                        help='simulated seconds (default 30)')
+    parser.add_argument('--laps', type=int, default=0,
+                        help='stop after this number of laps')
+    parser.add_argument('--target-speed', type=float, default=120,
+                        help='speed of target in mm/s (default 120)')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='MODULE.NAME=VALUE',
+                        help='override constant of a module or of the '
+                             'program, e.g. rover.SPEED_FAST=400 or '
+                             'chaser.KP=0.5')
+    parser.add_argument('--dropout', action='append', default=[],
+                        metavar='START:DURATION',
+                        help='disconnect Pixy2 at START for DURATION '
+                             'seconds, e.g. 5:2')
+    parser.add_argument('--json', action='store_true',
+                        help='print report as JSON')
+    args = parser.parse_args()
+
+    scenario = args.scenario
+    if scenario is None:
+        scenario = 'chase' if 'chaser' in args.program else 'line'
+    dropouts = [tuple(float(v) for v in text.split(':'))
+                for text in args.dropout]
+    sim = Simulation(scenario=scenario, track=TRACKS[args.track](),
+                     duration=args.duration, laps=args.laps,
+                     target_speed=args.target_speed, dropouts=dropouts)
+    overrides = dict(parse_override(text) for text in args.set)
+    try:
+        result = run_program(args.program, sim, overrides)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print('{:20}: {}'.format(key, value))
+
+
+if __name__ == '__main__':
+    main()